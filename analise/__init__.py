@@ -0,0 +1,26 @@
+"""Núcleo analítico do dashboard, sem dependência do Streamlit
+
+Carga, colunas derivadas, filtros, KPIs do resumo e a agregação de cada aba
+como funções sobre o handle do dataset (DatasetCompartilhado) ou sobre o
+cubo filtrado. Os apps só renderizam o que sai daqui.
+"""
+from analise.abas import (
+    METRICAS_TEMPO, anos_disponiveis, casos_mensais_por, casos_mes_ano, casos_responsavel_mes,
+    evolucao_tempo_solucao, meses_resolubilidade, metricas_responsavel_ano,
+    reaberturas_mes_ano, resolubilidade_mes, resumo_anual_tempo, resumo_responsaveis,
+    tabela_resolubilidade, tabela_tempo_solucao, tempo_por_tipo, tempo_solucao_mensal, top_contas,
+)
+from analise.filtragem import fatiar_cubo, fatiar_tempos, filtrar, opcoes_filtros, preparar_dataset
+from analise.resumo import calcular_metricas_responsaveis, calcular_resumo
+from ingest import calcular_colunas_derivadas
+from loader import carregar_dados, carregar_snapshot_existente
+
+__all__ = [
+    "METRICAS_TEMPO", "anos_disponiveis", "calcular_colunas_derivadas",
+    "calcular_metricas_responsaveis", "calcular_resumo", "carregar_dados",
+    "carregar_snapshot_existente", "casos_mensais_por", "casos_mes_ano", "casos_responsavel_mes",
+    "evolucao_tempo_solucao", "fatiar_cubo", "fatiar_tempos", "filtrar", "meses_resolubilidade",
+    "metricas_responsavel_ano", "opcoes_filtros", "preparar_dataset", "reaberturas_mes_ano", "resolubilidade_mes",
+    "resumo_anual_tempo", "resumo_responsaveis", "tabela_resolubilidade", "tabela_tempo_solucao",
+    "tempo_por_tipo", "tempo_solucao_mensal", "top_contas",
+]
@@ -0,0 +1,203 @@
+import calendar
+
+import numpy as np
+import pandas as pd
+
+from cubo import estatisticas_tempo
+
+# Métricas do tempo de solução: rótulo do seletor -> coluna de estatisticas_tempo e título
+METRICAS_TEMPO = {
+    "Média": {'coluna': 'Tempo_Medio', 'titulo': 'Tempo Médio'},
+    "Mediana (p50)": {'coluna': 'P50', 'titulo': 'Mediana'},
+    "p90": {'coluna': 'P90', 'titulo': 'Tempo p90'},
+    "Máximo": {'coluna': 'Maximo', 'titulo': 'Tempo Máximo'},
+}
+
+# Ordem dos meses na tabela detalhada do tempo de solução
+MESES_ORDEM = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun',
+               'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
+
+
+def _primeiro_nome(responsavel):
+    """Primeiro nome do responsável (numa coluna categórica, calculado só nas categorias)"""
+    if isinstance(responsavel.dtype, pd.CategoricalDtype):
+        nomes = responsavel.cat.categories.str.split().str[0].to_numpy(dtype=object)
+        # Código -1 (nulo) cai na posição extra do final
+        nomes = np.append(nomes, None)[responsavel.cat.codes.to_numpy()]
+        return pd.Series(nomes, index=responsavel.index).fillna("Não informado")
+    return responsavel.str.split().str[0].fillna("Não informado")
+
+
+def _mes_ano(cubo_filtrado, medida):
+    """Total da medida por (MesNum, MesNome, Ano), para as barras mês × ano"""
+    cubo_meses = cubo_filtrado.assign(
+        Ano=lambda x: x['Ano'].astype(str),
+        MesNum=lambda x: x['Mes'],
+        MesNome=lambda x: x['Mes'].map(lambda m: calendar.month_abbr[int(m)])
+    )
+    return cubo_meses.groupby(['MesNum', 'MesNome', 'Ano'])[medida].sum().reset_index(name='Total')
+
+
+# 1️⃣ Casos/Mês
+def casos_mes_ano(cubo_filtrado):
+    """Total de casos por mês e ano"""
+    return _mes_ano(cubo_filtrado, 'Casos')
+
+
+# 2️⃣ Origem e 6️⃣ Tipos
+def casos_mensais_por(cubo_filtrado, dimensao):
+    """Casos por mês e pela dimensão, com a ordem cronológica dos rótulos dos meses"""
+    meses_display_ordenados = cubo_filtrado.sort_values("AnoMes")["AnoMes_Display"].unique()
+    casos = (cubo_filtrado.groupby(["AnoMes", "AnoMes_Display", dimensao], observed=True)["Casos"].sum()
+             .reset_index(name="Total")
+             .sort_values("AnoMes"))
+    return casos, meses_display_ordenados
+
+
+# 3️⃣ Reaberturas
+def reaberturas_mes_ano(cubo_filtrado):
+    """Total de reaberturas por mês e ano"""
+    reaberturas_mes = _mes_ano(cubo_filtrado, 'Reaberturas')
+    reaberturas_mes['Total'] = reaberturas_mes['Total'].astype(int)
+    return reaberturas_mes
+
+
+# 4️⃣ Top Contas (única aba que ainda precisa das linhas: Conta não está no cubo)
+def top_contas(df_filtrado, n=10):
+    """As n contas com mais casos"""
+    contas = df_filtrado["Conta_Resumida"].value_counts()
+    contas = contas[contas > 0].nlargest(n).reset_index()
+    contas.columns = ["Conta", "Total"]
+    return contas
+
+
+def anos_disponiveis(cubo_filtrado):
+    """Anos presentes no recorte, em ordem"""
+    return sorted(cubo_filtrado["Ano"].dropna().astype(int).unique())
+
+
+# 5️⃣ Responsáveis
+def casos_responsavel_mes(cubo_filtrado, ano):
+    """Casos por mês e primeiro nome do responsável no ano escolhido"""
+    df_ano = cubo_filtrado[cubo_filtrado["Ano"] == ano].assign(
+        Primeiro_Nome=lambda x: _primeiro_nome(x["Responsável"])
+    )
+    casos_resp = (df_ano.groupby(["AnoMes", "AnoMes_Display", "Primeiro_Nome"], observed=True)
+                  ["Casos"].sum()
+                  .reset_index(name="Total"))
+    return casos_resp.sort_values(["AnoMes", "Total"], ascending=[True, False])
+
+
+def metricas_responsavel_ano(casos_resp):
+    """Cards da aba de responsáveis: total, média mensal e o responsável com mais casos"""
+    total_por_nome = casos_resp.groupby("Primeiro_Nome")["Total"].sum()
+    return {
+        'total_casos': casos_resp["Total"].sum(),
+        'media_mensal': casos_resp.groupby("AnoMes_Display", observed=True)["Total"].sum().mean(),
+        'responsavel_top': total_por_nome.idxmax(),
+        'casos_top': total_por_nome.max(),
+    }
+
+
+def resumo_responsaveis(casos_resp):
+    """Total, média, máximo e mínimo mensais por responsável, do maior para o menor"""
+    resumo = casos_resp.groupby("Primeiro_Nome").agg({
+        "Total": ["sum", "mean", "max", "min"]
+    }).round(1)
+
+    resumo.columns = ["Total Geral", "Média Mensal", "Máximo", "Mínimo"]
+    resumo = resumo.sort_values("Total Geral", ascending=False)
+
+    resumo["Variação"] = resumo["Máximo"] - resumo["Mínimo"]
+    resumo["% do Total"] = (resumo["Total Geral"] / resumo["Total Geral"].sum() * 100).round(1)
+    return resumo
+
+
+# 7️⃣ Resolubilidade
+def tabela_resolubilidade(cubo_filtrado):
+    """Casos e resolvidos no mesmo dia por (mês, primeiro nome), todos os meses de uma vez
+
+    Indexada pelo rótulo do mês, em ordem cronológica. É montada uma vez por
+    snapshot e seleção da sidebar; trocar o mês é só `resolubilidade_mes`.
+    """
+    tabela = (
+        cubo_filtrado
+        .assign(Primeiro_Nome=_primeiro_nome(cubo_filtrado["Responsável"]))
+        .groupby(["AnoMes", "AnoMes_Display", "Primeiro_Nome"], observed=True)[["Casos", "Mesmo_Dia"]].sum()
+        .reset_index()
+        .rename(columns={"Casos": "Total_Casos", "Mesmo_Dia": "Resolvidos_Mesmo_Dia"})
+    )
+    tabela["Perc_Resolubilidade"] = (tabela["Resolvidos_Mesmo_Dia"] / tabela["Total_Casos"]) * 100
+    tabela.index = pd.Index(tabela["AnoMes_Display"].astype(str), name="Mes_Display")
+    return tabela[["Primeiro_Nome", "Total_Casos", "Resolvidos_Mesmo_Dia", "Perc_Resolubilidade"]]
+
+
+def meses_resolubilidade(tabela):
+    """Rótulos dos meses da tabela de resolubilidade, em ordem cronológica"""
+    return tabela.index.unique().tolist()
+
+
+def resolubilidade_mes(tabela, mes):
+    """Total de casos, resolvidos no mesmo dia e % de resolubilidade por responsável no mês"""
+    return tabela.loc[[mes]].reset_index(drop=True)
+
+
+# 8️⃣ Tempo Solução
+def tempo_solucao_mensal(tempos_filtrados, anos):
+    """Estatísticas do tempo de solução por (Ano, AnoMes, Tipo) nos anos escolhidos"""
+    tempos_anos = tempos_filtrados[tempos_filtrados['Ano'].isin(anos)]
+    return estatisticas_tempo(tempos_anos, ['Ano', 'AnoMes', 'AnoMes_Display', 'Tipo'])
+
+
+def resumo_anual_tempo(tempos_filtrados, anos):
+    """Estatísticas do tempo de solução de cada ano escolhido"""
+    return estatisticas_tempo(tempos_filtrados[tempos_filtrados['Ano'].isin(anos)], ['Ano'])
+
+
+def tempo_por_tipo(df_tempo, tempos_filtrados, ano, coluna='Tempo_Medio'):
+    """Métrica por tipo no ano (mini gráfico do card), na coluna Tempo_Medio
+
+    A média segue o gráfico original (média dos tempos médios mensais);
+    mediana, p90 e máximo são exatos sobre os casos do ano.
+    """
+    if coluna == 'Tempo_Medio':
+        return df_tempo[df_tempo['Ano'] == ano].groupby('Tipo', observed=True).agg(
+            Tempo_Medio=('Tempo_Medio', 'mean')
+        ).reset_index()
+    tempos_ano = tempos_filtrados[tempos_filtrados['Ano'] == ano]
+    return estatisticas_tempo(tempos_ano, ['Tipo'])[['Tipo', coluna]].rename(columns={coluna: 'Tempo_Medio'})
+
+
+def evolucao_tempo_solucao(df_tempo, coluna='Tempo_Medio'):
+    """Série mensal ordenada, com o rótulo da métrica (<coluna>_Label) para o gráfico de facetas"""
+    df_evolucao = df_tempo.sort_values(['Ano', 'AnoMes'])
+    df_evolucao[f'{coluna}_Label'] = df_evolucao[coluna].apply(
+        lambda x: f"{x:.2f}".replace('.', ',') if pd.notnull(x) else ''
+    )
+    return df_evolucao
+
+
+def tabela_tempo_solucao(df_evolucao, anos, coluna='Tempo_Medio'):
+    """Métrica do tempo de solução por tipo e mês, uma coluna formatada por ano"""
+    pivot_table = df_evolucao.pivot_table(
+        index=['Tipo', 'AnoMes_Display'],
+        columns='Ano',
+        values=coluna,
+        aggfunc='mean',
+        observed=True
+    ).reset_index()
+
+    # Extrair apenas o mês da coluna AnoMes_Display e consolidar por Tipo e Mês
+    pivot_table['Mês'] = pivot_table['AnoMes_Display'].str.split('/').str[0]
+    pivot_table = pivot_table.drop('AnoMes_Display', axis=1)
+    pivot_table = pivot_table.groupby(['Tipo', 'Mês'], observed=True).first().reset_index()
+
+    pivot_table['Mês'] = pd.Categorical(pivot_table['Mês'], categories=MESES_ORDEM, ordered=True)
+    pivot_table = pivot_table.sort_values(['Tipo', 'Mês'])
+
+    for ano in anos:
+        if ano in pivot_table.columns:
+            pivot_table[ano] = pivot_table[ano].apply(
+                lambda x: f"{x:,.2f} dias".replace('.', ',') if pd.notna(x) else "-"
+            )
+    return pivot_table
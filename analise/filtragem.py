@@ -0,0 +1,60 @@
+from cubo import CuboCasos, DistribuicaoTempos
+from diagnostico import etapa
+from filtros import IndiceFiltros, OpcoesFiltros
+
+
+def preparar_dataset(dataset):
+    """Estruturas derivadas montadas antes de publicar cada snapshot"""
+    dataset.derivado("indice_filtros", IndiceFiltros)
+    dataset.derivado("opcoes_filtros", OpcoesFiltros)
+    dataset.derivado("cubo", CuboCasos)
+    dataset.derivado("tempos", DistribuicaoTempos)
+
+
+def opcoes_filtros(dataset):
+    """Opções e contagens por valor dos filtros da sidebar (do snapshot)"""
+    return dataset.derivado("opcoes_filtros", OpcoesFiltros)
+
+
+def filtrar(dataset, selecao, cache=None):
+    """Linhas do dataset que atendem à seleção (via índice invertido do snapshot)
+
+    Com um CacheFiltros, o resultado é reaproveitado entre reruns e sessões
+    enquanto a versão do snapshot e a seleção forem as mesmas. Uma seleção
+    que não restringe nada devolve `dataset.df` direto, fora do cache.
+    """
+    indice = dataset.derivado("indice_filtros", IndiceFiltros)
+    with etapa("filter_data", linhas=len(dataset)) as registro:
+        # Sem restrição: o próprio dataset, sem ocupar (nem contar bytes no) cache
+        if not indice.restringe(selecao):
+            registro.cache = "sem filtro"
+            registro.linhas_saida = len(dataset)
+            return dataset.df
+
+        registro.cache = "hit"
+
+        def calcular():
+            registro.cache = "miss"
+            return indice.aplicar(dataset.df, indice.filtrar(selecao))
+
+        df_filtrado = calcular() if cache is None else cache.obter(dataset.versao, selecao, calcular)
+        registro.linhas_saida = len(df_filtrado)
+    return df_filtrado
+
+
+def fatiar_cubo(dataset, selecao):
+    """Células do cubo pré-agregado do snapshot que atendem à seleção"""
+    cubo = dataset.derivado("cubo", CuboCasos)
+    with etapa("cubo", linhas=len(cubo)) as registro:
+        cubo_filtrado = cubo.fatiar(selecao)
+        registro.linhas_saida = len(cubo_filtrado)
+    return cubo_filtrado
+
+
+def fatiar_tempos(dataset, selecao):
+    """Distribuição dos dias até a solução (por célula do cubo) que atende à seleção"""
+    tempos = dataset.derivado("tempos", DistribuicaoTempos)
+    with etapa("tempos", linhas=len(tempos)) as registro:
+        tempos_filtrados = tempos.fatiar(selecao)
+        registro.linhas_saida = len(tempos_filtrados)
+    return tempos_filtrados
@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+
+from diagnostico import etapa
+
+
+def calcular_metricas_responsaveis(casos_por_responsavel, total_casos):
+    """Calcula métricas detalhadas dos responsáveis (a partir das contagens do cubo)"""
+
+    # Responsáveis únicos APÓS o agrupamento
+    responsaveis_agrupados = len(casos_por_responsavel)
+
+    # Casos atribuídos a "Outro"
+    tem_outros = 'Outro' in casos_por_responsavel.index
+    casos_outros = int(casos_por_responsavel['Outro']) if tem_outros else 0
+
+    # Responsáveis principais (não "Outro")
+    responsaveis_principais = responsaveis_agrupados - 1 if tem_outros else responsaveis_agrupados
+
+    # Percentual de casos "Outro"
+    perc_outros = (casos_outros / total_casos * 100) if total_casos > 0 else 0
+
+    return {
+        'total_agrupados': responsaveis_agrupados,
+        'principais': responsaveis_principais,
+        'casos_outros': casos_outros,
+        'perc_outros': perc_outros,
+        'tem_outros': tem_outros
+    }
+
+
+def _codigos(serie):
+    """Códigos inteiros (-1 = nulo) e valores distintos, em ordem, da coluna"""
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        return serie.cat.codes.to_numpy(), serie.cat.categories
+    return pd.factorize(serie, sort=True)
+
+
+def _somar_por(codigos, n, *medidas):
+    """Soma de cada medida por código e quais códigos aparecem (bincount, uma passada por medida)"""
+    validos = codigos >= 0
+    codigos = codigos[validos]
+    presentes = np.bincount(codigos, minlength=n) > 0
+    somas = [np.bincount(codigos, weights=m[validos], minlength=n).astype('int64')[presentes] for m in medidas]
+    return presentes, somas
+
+
+# ✅ OTIMIZAÇÃO: Kernel único dos KPIs - códigos das dimensões + bincount sobre o cubo filtrado,
+# sem cópias, groupbys ou varreduras repetidas
+def calcular_resumo(cubo_filtrado):
+    """Métricas dos cards do resumo e séries dos mini gráficos"""
+    with etapa("resumo:kpis", linhas=len(cubo_filtrado)):
+        casos = cubo_filtrado['Casos'].to_numpy(dtype='int64')
+        reaberturas = cubo_filtrado['Reaberturas'].to_numpy(dtype='int64')
+        total_casos = int(casos.sum())
+
+        # Casos e reaberturas por ano (anos como inteiros)
+        codigos_ano, anos = _codigos(cubo_filtrado['Ano'])
+        presentes, (casos_ano, reaberturas_ano) = _somar_por(codigos_ano, len(anos), casos, reaberturas)
+        indice_anos = pd.Index(np.asarray(anos)[presentes].astype(int), name='Ano_Int')
+
+        # Mês atual dos dados (último mês disponível)
+        codigos_mes, _ = _codigos(cubo_filtrado['AnoMes'])
+        no_ultimo_mes = codigos_mes == codigos_mes.max()
+
+        # Casos por responsável
+        codigos_resp, responsaveis = _codigos(cubo_filtrado['Responsável'])
+        presentes_resp, (casos_resp,) = _somar_por(codigos_resp, len(responsaveis), casos)
+        casos_por_responsavel = pd.Series(
+            casos_resp, index=pd.Index(np.asarray(responsaveis)[presentes_resp], name='Responsável'), name='Casos'
+        )
+
+        return {
+            'total_casos': total_casos,
+            'casos_por_ano': pd.Series(casos_ano, index=indice_anos, name='Casos'),
+            'casos_mes_atual': int(casos[no_ultimo_mes].sum()),
+            'mes_atual_nome': cubo_filtrado['AnoMes_Display'].iloc[int(np.argmax(no_ultimo_mes))],
+            'total_reaberturas': reaberturas.sum(),
+            'reaberturas_por_ano': pd.Series(reaberturas_ano, index=indice_anos, name='Reaberturas'),
+            'casos_por_responsavel': casos_por_responsavel,
+            'metricas_resp': calcular_metricas_responsaveis(casos_por_responsavel, total_casos),
+        }
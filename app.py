@@ -2,15 +2,33 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-import gdown
 from io import BytesIO
 import requests
-import calendar
 import numpy as np
-from functools import lru_cache
-import pickle
+from functools import lru_cache, wraps
+import html
 import os
-from datetime import datetime, timedelta
+
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from analise import (
+    METRICAS_TEMPO, anos_disponiveis, calcular_resumo, casos_mensais_por, casos_mes_ano,
+    casos_responsavel_mes, evolucao_tempo_solucao, fatiar_cubo, fatiar_tempos, filtrar,
+    meses_resolubilidade, metricas_responsavel_ano, opcoes_filtros, preparar_dataset, reaberturas_mes_ano,
+    resolubilidade_mes, resumo_anual_tempo, resumo_responsaveis, tabela_resolubilidade,
+    tabela_tempo_solucao, tempo_por_tipo, tempo_solucao_mensal, top_contas,
+)
+from cubo import CuboCasos, DistribuicaoTempos
+from dataset import AtualizadorDataset, RegistroMemoria
+from diagnostico import (
+    DIAGNOSTICO_ARQUIVO, coleta_fragmento, cronometrado, encerrar_coleta, etapa, iniciar_coleta,
+)
+from figuras import CacheFiguras
+from filtros import (
+    FILTROS_SIDEBAR, CacheFiltros, CachePorSelecao, atualizar_excluidos, dimensoes_ativas, rotulo_opcao,
+)
+from loader import TTL_SNAPSHOT, carregar_dados, carregar_snapshot_existente
+from snapshot_store import invalidar_snapshot, ler_metadados, snapshot_valido
 
 def inject_universal_css():
     """Injeta CSS que funciona em dark e light mode"""
@@ -46,14 +64,6 @@ def inject_universal_css():
     </style>
     """, unsafe_allow_html=True)
 
-def formatar_mes_pt(data):
-    """Formata data para mês abreviado em português"""
-    meses = {
-        1: 'Jan', 2: 'Fev', 3: 'Mar', 4: 'Abr', 5: 'Mai', 6: 'Jun',
-        7: 'Jul', 8: 'Ago', 9: 'Set', 10: 'Out', 11: 'Nov', 12: 'Dez'
-    }
-    return f"{meses[data.month]}/{data.year}"
-
 def traduzir_mes(mes_nome):
     """Traduz nome do mês em inglês para português abreviado"""
     traducao = {
@@ -123,90 +133,57 @@ def apply_universal_theme(fig, theme_mode='auto'):
     
     return fig
 
+# Variante do dashboard: dimensões filtráveis da sidebar (None = todas as configuradas).
+# app1.py injeta a sua lista ao executar este script; FILTROS_DASHBOARD no ambiente vale para qualquer deploy
+FILTROS_DASHBOARD = globals().get("FILTROS_DASHBOARD", os.environ.get("FILTROS_DASHBOARD"))
+
 st.set_page_config(page_title="Indicadores de dados", layout="wide")
 inject_universal_css()
 current_theme = detect_streamlit_theme()
 
+# 🩺 Diagnóstico opcional: cronometra as etapas deste rerun (toggle na sidebar ou DIAGNOSTICO=1)
+# Coleta deixada aberta por um rerun interrompido (exceção, RerunException) é gravada e fechada aqui
+ctx = get_script_run_ctx()
+encerrar_coleta(interrompida=True)
+diagnostico_ativo = st.session_state.get("diagnostico", False) or os.environ.get("DIAGNOSTICO") == "1"
+coleta = iniciar_coleta(ctx.session_id if ctx is not None else None) if diagnostico_ativo else None
+
+def finalizar_diagnostico():
+    """Encerra a coleta do rerun e mostra o painel (chamada no fim do script e antes de cada st.stop)"""
+    if coleta is None:
+        return
+    encerrar_coleta()
+    with st.sidebar.expander("🩺 Diagnóstico do rerun", expanded=True):
+        st.caption(f"Rerun completo: {coleta.total_ms:,.0f} ms · gravado em {DIAGNOSTICO_ARQUIVO}")
+        carga = atualizador.ultima_carga
+        if carga is not None:
+            st.caption(
+                f"Última carga do dataset (segundo plano): {carga['segundos']:,.1f} s · "
+                f"{carga['linhas'] or 0:,} linhas · {carga['em']:%H:%M:%S}"
+            )
+        st.dataframe(coleta.tabela(), use_container_width=True, hide_index=True)
+
+def fragmento_diagnosticado(nome):
+    """Nos reruns só do @st.fragment (sem coleta do script) abre uma coleta própria para o fragmento"""
+    def decorador(func):
+        @wraps(func)
+        def envolvida(*args, **kwargs):
+            ctx_fragmento = get_script_run_ctx()
+            if not diagnostico_ativo or ctx_fragmento is None or not ctx_fragmento.fragment_ids_this_run:
+                return func(*args, **kwargs)
+            with coleta_fragmento(nome, ctx_fragmento.session_id):
+                return func(*args, **kwargs)
+        return envolvida
+    return decorador
+
 st.title("📊 Indicadores de casos")
 
-# ✅ OTIMIZAÇÃO: Cache persistente e otimizado
-@st.cache_data(ttl=1800, show_spinner=False)
-def load_data_optimized():
+# ✅ OTIMIZAÇÃO: Cache persistente e otimizado (executado pelo atualizador em segundo plano)
+# Roda fora de qualquer rerun: erros sobem para o atualizador (ultimo_erro) e são exibidos pelo app
+@cronometrado("load_data_optimized")
+def load_data_optimized(incremental=True):
     """Carregamento otimizado com cache persistente"""
-    
-    # Verificar cache local
-    cache_file = 'data_cache.pkl'
-    cache_time_file = 'cache_time.txt'
-    
-    if os.path.exists(cache_file) and os.path.exists(cache_time_file):
-        try:
-            with open(cache_time_file, 'r') as f:
-                cache_time = datetime.fromisoformat(f.read().strip())
-            
-            if datetime.now() - cache_time < timedelta(minutes=30):
-                with open(cache_file, 'rb') as f:
-                    return pickle.load(f)
-        except:
-            pass
-    
-    file_id = "1SqSOc1xsb1i9hxq2OziyxWHrG3GAs450"
-    url = f"https://drive.google.com/uc?id={file_id}"
-    
-    responsaveis_outros_set = {
-        "Alexsandro Fernandes Maffei", "Ana Caroline Mendes Carvalho",
-        "Brenda Bertotti Ribeiro", "Bruno Macagnan Do Nascimento",
-        "Cleiton Bitencourt De Souza", "Cristian Macagnan Reus",
-        "Douglas Gonçalves E Barra", "Fabiana Bressan",
-        "Filipe Dos Santos Batista", "Guilherme De Costa Sonego",
-        "Guilherme Medeiros Rodrigues", "Henrique Da Rosa Josefino",
-        "Inaiá Rovaris", "João Victor Dagostin Dos Santos",
-        "João Vitor Ghellere", "Jose Victor Padilha Inacio",
-        "Kenny Robert Rodrigues", "Lucas Demetrio De Abreu",
-        "Lucas Demetrio Pizzoni", "Lucas Jacques Costa",
-        "Luiz Gustavo Uggioni Savi", "Marlon De Bem",
-        "Otomar Rocha Speck", "Outro", "Rafael Dias Rocha (Rafa)",
-        "Ramiriz Leal", "Susan Carboni"
-    }
-    
-    def agrupar_responsavel(nome):
-        return "Outro" if nome in responsaveis_outros_set else nome
-
-    try:
-        output = 'temp_file.xlsx'
-        gdown.download(url, output, quiet=True)
-        
-        df = pd.read_excel(output, parse_dates=["Abertura", "Solução"])
-        df.columns = df.columns.map(str)
-        
-        # Processamento otimizado
-        df["AnoMes"] = df["Abertura"].dt.strftime('%Y-%m')
-        df["AnoMes_Display"] = df["Abertura"].apply(formatar_mes_pt)
-        df["Ano"] = df["Abertura"].dt.year
-        df["Conta_Resumida"] = df["Conta"].apply(lambda x: ' '.join(x.split()[:2]) if pd.notnull(x) else x)
-        df['Responsável'] = df['Responsável'].apply(agrupar_responsavel)
-        df['Data de Abertura'] = pd.to_datetime(df['Abertura'])
-
-        # Salvar cache
-        with open(cache_file, 'wb') as f:
-            pickle.dump(df, f)
-        with open(cache_time_file, 'w') as f:
-            f.write(datetime.now().isoformat())
-        
-        return df
-        
-    except Exception as e:
-        st.error(f"Erro ao carregar dados: {e}")
-        return None
-
-# ✅ OTIMIZAÇÃO: Cache para filtros
-@st.cache_data(show_spinner=False)
-def filter_data(df, anos, origens, responsaveis, tipos):
-    return df[
-        df["Ano"].isin(anos) &
-        df["Origem"].isin(origens) &
-        df["Responsável"].isin(responsaveis) &
-        df["Tipo"].isin(tipos)
-    ].copy() 
+    return carregar_dados(incremental=incremental)
 
 # ✅ FUNÇÃO CORRIGIDA para criar mini gráfico de barras horizontais
 def create_mini_horizontal_bar(data, title, color="#d62728", height=100):
@@ -299,38 +276,86 @@ def create_mini_horizontal_bar2(data, title, color, height=150):
     
     return fig
 
-# ✅ FUNÇÃO MELHORADA: Métricas detalhadas de responsáveis
-def calcular_metricas_responsaveis(df_filtrado):
-    """Calcula métricas detalhadas dos responsáveis"""
-    
-    # Responsáveis únicos APÓS o agrupamento
-    responsaveis_agrupados = df_filtrado['Responsável'].nunique()
-    
-    # Casos atribuídos a "Outro"
-    casos_outros = len(df_filtrado[df_filtrado['Responsável'] == 'Outro'])
-    
-    # Responsáveis principais (não "Outro")
-    responsaveis_principais = df_filtrado[
-        df_filtrado['Responsável'] != 'Outro'
-    ]['Responsável'].nunique() if 'Outro' in df_filtrado['Responsável'].values else responsaveis_agrupados
-    
-    # Percentual de casos "Outro"
-    perc_outros = (casos_outros / len(df_filtrado) * 100) if len(df_filtrado) > 0 else 0
-    
-    return {
-        'total_agrupados': responsaveis_agrupados,
-        'principais': responsaveis_principais,
-        'casos_outros': casos_outros,
-        'perc_outros': perc_outros,
-        'tem_outros': 'Outro' in df_filtrado['Responsável'].values
-    }
+# Cores fixas por ano nos gráficos mês × ano
+CORES_POR_ANO = {
+    '2023': '#ff7f0e',
+    '2024': '#aec7e8',
+    '2025': '#1f77b4'
+}
+
+# ✅ OTIMIZAÇÃO: Barras agrupadas mês × ano montadas de forma vetorizada
+def criar_grafico_mes_ano(totais, titulo_y, cores_por_ano=CORES_POR_ANO):
+    """Gráfico de barras agrupadas por mês, com uma barra por ano
+
+    `totais` tem uma linha por (MesNum, MesNome, Ano) com a coluna Total.
+    Posições, cores, ticks e anotações dos meses saem de operações sobre
+    arrays: cada mês ocupa uma faixa contígua e há duas posições vazias
+    entre meses consecutivos.
+    """
+    totais = totais.sort_values(['MesNum', 'Ano'], kind='stable', ignore_index=True)
+    indice_mes = pd.factorize(totais['MesNum'], sort=True)[0]
+    posicoes = np.arange(len(totais)) + 2 * indice_mes
+
+    faixas = pd.Series(posicoes).groupby(indice_mes).agg(['min', 'max'])
+    centros = (faixas['min'] + faixas['max']) / 2
+    nomes_meses = totais['MesNome'].groupby(indice_mes).first()
+
+    fig = go.Figure()
+
+    fig.add_trace(go.Bar(
+        x=posicoes.tolist(),
+        y=totais['Total'].tolist(),
+        marker_color=totais['Ano'].map(cores_por_ano).fillna('#333333').tolist(),
+        text=totais['Total'].astype(str).tolist(),
+        textposition='outside',
+        width=0.7
+    ))
+
+    anotacoes = [
+        dict(
+            x=pos_central,
+            y=1.05,
+            xref='x',
+            yref='paper',
+            text=traduzir_mes(mes_nome),
+            showarrow=False,
+            font=dict(size=14, color='white'),
+            xanchor='center'
+        )
+        for mes_nome, pos_central in zip(nomes_meses, centros)
+    ]
+
+    fig.update_layout(
+        xaxis=dict(
+            tickmode='array',
+            tickvals=posicoes.tolist(),
+            ticktext=totais['Ano'].tolist(),
+            title=None,
+            showgrid=False
+        ),
+        yaxis=dict(
+            title=titulo_y,
+            gridcolor='rgba(255,255,255,0.1)'
+        ),
+        annotations=anotacoes,
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='white'),
+        margin=dict(t=80, b=50, l=50, r=50),
+        height=500,
+        bargap=0,
+        bargroupgap=0
+    )
+
+    return fig
 
 # ✅ FUNÇÃO MELHORADA: Mini gráfico de responsáveis
-def create_mini_responsaveis_chart_improved(df_filtrado, height=100):
+def create_mini_responsaveis_chart_improved(casos_por_responsavel, height=100):
     """Cria mini gráfico MELHORADO mostrando distribuição de responsáveis"""
     
     # Top 4 responsáveis por casos
-    top_resp = df_filtrado['Responsável'].value_counts().head(4)
+    top_resp = casos_por_responsavel.sort_values(ascending=False)
+    top_resp = top_resp[top_resp > 0].head(4)
     
     fig = go.Figure()
     
@@ -389,30 +414,77 @@ def create_mini_responsaveis_chart_improved(df_filtrado, height=100):
     
     return fig
 
-# ✅ OTIMIZAÇÃO: Session state para dados
-if 'df' not in st.session_state:
-    with st.spinner("🚀 Carregando dados..."):
-        st.session_state.df = load_data_optimized()
+# ✅ OTIMIZAÇÃO: Dataset único por processo, compartilhado (somente leitura) entre sessões
+# e recarregado em segundo plano, com troca atômica do snapshot. Um único atualizador por
+# processo: se a primeira carga falhar ele mesmo tenta de novo, sem ser recriado a cada rerun
+@st.cache_resource(show_spinner=False, on_release=lambda atualizador: atualizador.parar())
+def obter_atualizador():
+    inicial, meta = carregar_snapshot_existente()
+    return AtualizadorDataset(
+        load_data_optimized,
+        intervalo=1800,
+        inicial=inicial,
+        gerado_em=meta['gerado_em'] if inicial is not None else None,
+        atualizar_ja=not snapshot_valido(meta, TTL_SNAPSHOT),
+        assinatura=lambda: (ler_metadados() or {}).get('dados_em'),
+        preparar=preparar_dataset,
+    )
+
+@st.cache_resource(show_spinner=False)
+def obter_registro_memoria():
+    return RegistroMemoria()
+
+# ✅ OTIMIZAÇÃO: Figuras serializadas em cache, por tipo + hash do agregado + tema;
+# reruns com os mesmos agregados não reconstroem nem validam figuras plotly
+@st.cache_resource(show_spinner=False)
+def obter_cache_figuras():
+    return CacheFiguras(max_entradas=256, max_bytes=64 * 1024 * 1024)
+
+def figura_em_cache(tipo, entradas, construir):
+    with etapa(f"figura:{tipo}") as registro:
+        registro.cache = "hit"
+
+        def construir_registrando():
+            registro.cache = "miss"
+            return construir()
+
+        return obter_cache_figuras().obter(tipo, (entradas, current_theme), construir_registrando)
+
+def exibir_figura(fig, **kwargs):
+    """st.plotly_chart cronometrado (serialização da figura para o frontend)"""
+    with etapa("plotly_chart"):
+        st.plotly_chart(fig, **kwargs)
+
+with st.spinner("🚀 Carregando dados..."):
+    atualizador = obter_atualizador()
 
-df = st.session_state.df
+dataset = atualizador.atual
 
-if df is None:
-    st.error("Falha ao carregar os dados.")
+if dataset is None:
+    atualizador.solicitar_atualizacao()
+    st.error(f"Falha ao carregar os dados: {atualizador.ultimo_erro or 'carga em andamento'}. "
+             "Nova tentativa em segundo plano; recarregue a página em instantes.")
+    finalizar_diagnostico()
     st.stop()
 
+df = dataset.df
+
 # ✅ Header com botão de atualização e data - ALINHADOS
 col_btn, col_data = st.columns([1, 6])
 
 with col_btn:
     if st.button("🔄 Atualizar", help="Força atualização dos dados"):
         st.cache_data.clear()
-        for file in ['data_cache.pkl', 'cache_time.txt']:
-            if os.path.exists(file):
-                os.remove(file)
-        st.rerun()
+        invalidar_snapshot()
+        atualizador.solicitar_atualizacao()
+        st.toast("🔄 Atualização iniciada em segundo plano")
 
 # ✅ Informações do dataset ao lado do botão
-maior_data_abertura = df['Data de Abertura'].max().strftime('%d/%m/%Y')
+maior_data_abertura = df['Abertura'].max().strftime('%d/%m/%Y')
+idade_min = int(dataset.idade.total_seconds() // 60)
+status_snapshot = "⏳ atualizando..." if atualizador.em_atualizacao else f"verificado há {idade_min} min"
+if atualizador.ultimo_erro and not atualizador.em_atualizacao:
+    status_snapshot += f" · ⚠️ última atualização falhou: {html.escape(atualizador.ultimo_erro)}"
 with col_data:
     st.markdown(
         f"""
@@ -420,71 +492,119 @@ with col_data:
             <span style="background-color: #d4edda; color: #155724; padding: 6px 12px; border-radius: 4px; font-size: 14px;">
                 ✅ Atualizado até: {maior_data_abertura}
             </span>
+            <span style="color: #666; margin-left: 10px; font-size: 12px;">
+                Snapshot v{dataset.versao} · {status_snapshot}
+            </span>
         </div>
         """, 
         unsafe_allow_html=True
     )
 
-# Filtros otimizados
+# ✅ Filtros definidos por configuração (filtros.FILTROS_SIDEBAR) e detectados nas colunas carregadas
+# ✅ OTIMIZAÇÃO: Opções e casos por valor vêm prontos do snapshot (nada é varrido a cada rerun)
+# ✅ Filtros em cascata: cada multiselect só oferece valores com casos dadas as escolhas nos outros,
+# calculados sobre a tabela de coocorrência do snapshot. A sessão guarda o que o usuário desmarcou,
+# então valores escondidos por outro filtro voltam no estado em que estavam
 st.sidebar.header("🔍 Filtros")
 
-anos = sorted(df["Ano"].dropna().astype(int).unique())
-origens = sorted(df["Origem"].dropna().unique())
-responsaveis = sorted(df["Responsável"].dropna().unique())
-tipos = sorted(df["Tipo"].dropna().unique())
-produtos = sorted(df["Produto"].dropna().unique()) if "Produto" in df.columns else []
-
-ano_sel = st.sidebar.multiselect("Ano:", anos, default=anos)
-origem_sel = st.sidebar.multiselect("Origem:", origens, default=origens)
-resp_sel = st.sidebar.multiselect("Responsável:", responsaveis, default=responsaveis)
-tipo_sel = st.sidebar.multiselect("Tipo:", tipos, default=tipos)
-produto_sel = st.sidebar.multiselect("Produto:", produtos, default=produtos) if produtos else []
-
-@st.cache_data(show_spinner=False)
-def filter_data(df, anos, origens, responsaveis, tipos, produtos):
-    return df[
-        df["Ano"].isin(anos) &
-        df["Origem"].isin(origens) &
-        df["Responsável"].isin(responsaveis) &
-        df["Tipo"].isin(tipos) &
-        df["Produto"].isin(produtos)
-    ].copy()
+filtros_snapshot = opcoes_filtros(dataset)
+dimensoes_sidebar = [
+    dim for dim in dimensoes_ativas(df.columns, FILTROS_DASHBOARD) if filtros_snapshot.opcoes[dim]
+]
+excluidos = st.session_state.setdefault("filtros_excluidos", {})
+mostrados = st.session_state.setdefault("filtros_mostrados", {})
+for dim in dimensoes_sidebar:
+    if f"filtro_{dim}" in st.session_state and dim in mostrados:
+        excluidos[dim] = atualizar_excluidos(
+            excluidos.get(dim, []), mostrados[dim], st.session_state[f"filtro_{dim}"]
+        )
+
+with etapa("facetas", linhas=len(filtros_snapshot.casos)):
+    facetas = filtros_snapshot.facetas(dimensoes_sidebar, excluidos)
+
+selecao = {}
+for dim in dimensoes_sidebar:
+    opcoes = list(facetas[dim])
+    desmarcados = set(excluidos.get(dim, []))
+    mostrados[dim] = opcoes
+    st.session_state[f"filtro_{dim}"] = [v for v in opcoes if v not in desmarcados]
+    selecao[dim] = st.sidebar.multiselect(
+        FILTROS_SIDEBAR[dim]['rotulo'], opcoes, key=f"filtro_{dim}",
+        format_func=rotulo_opcao(facetas[dim]),
+    )
+
+# ✅ OTIMIZAÇÃO: Filtros via índices invertidos pré-computados por snapshot,
+# com cache LRU chaveado por versão do snapshot + seleção
+@st.cache_resource(show_spinner=False)
+def obter_cache_filtros():
+    return CacheFiltros(max_entradas=64, max_bytes=512 * 1024 * 1024)
 
+# ✅ OTIMIZAÇÃO: Tabela de resolubilidade (todos os meses) por snapshot + seleção da sidebar,
+# num cache próprio e pequeno: tabelas não disputam espaço com os DataFrames filtrados
+@st.cache_resource(show_spinner=False)
+def obter_cache_resolubilidade():
+    return CachePorSelecao(max_entradas=16, max_bytes=8 * 1024 * 1024)
 
 # Aplicar filtros
-df_filtrado = filter_data(df, ano_sel, origem_sel, resp_sel, tipo_sel, produto_sel)
+df_filtrado = filtrar(dataset, selecao, cache=obter_cache_filtros())
+
+# ✅ OTIMIZAÇÃO: Resumo e abas consultam o cubo pré-agregado do snapshot
+cubo_filtrado = fatiar_cubo(dataset, selecao)
+
+# ✅ Contabilidade de memória: bytes próprios desta sessão (o dataset é compartilhado).
+# Sem filtro o df_filtrado é o próprio dataset e, com filtro, em geral uma entrada do cache de
+# filtros: nos dois casos a memória é de todas as sessões e conta 0 para esta
+registro_memoria = obter_registro_memoria()
+if ctx is not None:
+    compartilhado = df_filtrado is df or obter_cache_filtros().contem(df_filtrado)
+    registro_memoria.registrar(ctx.session_id, "df_filtrado", None if compartilhado else df_filtrado)
+
+with st.sidebar.expander("🧮 Memória por sessão", expanded=False):
+    st.caption(f"Dataset compartilhado: {dataset.nbytes / 1e6:,.1f} MB (versão {dataset.versao})")
+    cubo = dataset.derivado("cubo", CuboCasos)
+    st.caption(f"Cubo: {len(cubo):,} células · {cubo.nbytes / 1e6:,.1f} MB")
+    tempos = dataset.derivado("tempos", DistribuicaoTempos)
+    st.caption(f"Distribuição de tempos: {len(tempos):,} linhas · {tempos.nbytes / 1e6:,.1f} MB")
+    st.caption(f"Coocorrência dos filtros: {len(filtros_snapshot.casos):,} combinações · "
+               f"{filtros_snapshot.nbytes / 1e6:,.1f} MB")
+    cache_filtros = obter_cache_filtros().estatisticas()
+    st.caption(
+        f"Cache de filtros: {cache_filtros['hits']} hits / {cache_filtros['misses']} misses · "
+        f"{cache_filtros['entradas']} entradas · {cache_filtros['bytes'] / 1e6:,.1f} MB"
+    )
+    cache_tabelas = obter_cache_resolubilidade().estatisticas()
+    st.caption(
+        f"Cache de tabelas (resolubilidade): {cache_tabelas['hits']} hits / {cache_tabelas['misses']} misses · "
+        f"{cache_tabelas['entradas']} entradas · {cache_tabelas['bytes'] / 1e6:,.1f} MB"
+    )
+    cache_figuras = obter_cache_figuras().estatisticas()
+    st.caption(
+        f"Cache de figuras: {cache_figuras['hits']} hits / {cache_figuras['misses']} misses · "
+        f"{cache_figuras['entradas']} entradas · {cache_figuras['bytes'] / 1e6:,.1f} MB"
+    )
+    st.dataframe(registro_memoria.resumo(), use_container_width=True, hide_index=True)
+
+st.sidebar.toggle("🩺 Diagnóstico", key="diagnostico",
+                  help="Cronometra as etapas de cada rerun e grava em JSON lines")
 
 if df_filtrado.empty:
     st.warning("⚠️ Nenhum dado para os filtros selecionados.")
+    finalizar_diagnostico()
     st.stop()
 
 # ✅ RESUMO EXECUTIVO MELHORADO
 st.markdown("---")
 st.subheader("📊 Resumo")
 
-# ✅ CORRIGIDO: Calcular métricas garantindo anos como inteiros
-total_casos = len(df_filtrado)
-
-# ✅ CORRIGIDO: Forçar anos como inteiros na agregação
-df_work = df_filtrado.copy()
-df_work.loc[:, 'Ano_Int'] = df_work['Ano'].astype(int)
-casos_por_ano = df_work.groupby('Ano_Int').size().sort_index()
-
-# Mês atual dos dados (último mês disponível)
-ultimo_mes_dados = df_filtrado['Abertura'].max()
-casos_mes_atual = len(df_filtrado[
-    (df_filtrado['Abertura'].dt.month == ultimo_mes_dados.month) & 
-    (df_filtrado['Abertura'].dt.year == ultimo_mes_dados.year)
-])
-
-mes_atual_nome = formatar_mes_pt(ultimo_mes_dados)
-
-# ✅ CORRIGIDO: Reaberturas garantindo anos como inteiros
-total_reaberturas = df_filtrado['Qt Reab.'].sum()
-reaberturas_por_ano = df_work.groupby('Ano_Int')['Qt Reab.'].sum().sort_index()
-
-# ✅ NOVO: Métricas detalhadas de responsáveis
-metricas_resp = calcular_metricas_responsaveis(df_filtrado)
+resumo = calcular_resumo(cubo_filtrado)
+total_casos = resumo['total_casos']
+casos_por_ano = resumo['casos_por_ano']
+casos_mes_atual = resumo['casos_mes_atual']
+mes_atual_nome = resumo['mes_atual_nome']
+total_reaberturas = resumo['total_reaberturas']
+reaberturas_por_ano = resumo['reaberturas_por_ano']
+casos_por_responsavel = resumo['casos_por_responsavel']
+metricas_resp = resumo['metricas_resp']
 
 # Layout das métricas
 col1, col2, col3, col4 = st.columns(4)
@@ -503,9 +623,12 @@ with col1:
     
     # Mini gráfico CORRIGIDO
     if len(casos_por_ano) > 1:
-        fig_casos = create_mini_horizontal_bar(casos_por_ano, "Casos por Ano", "#1f77b4", 100)
-        fig_casos = apply_universal_theme(fig_casos, current_theme)
-        st.plotly_chart(fig_casos, use_container_width=True, config={'displayModeBar': False})
+        def construir_fig_casos():
+            fig_casos = create_mini_horizontal_bar(casos_por_ano, "Casos por Ano", "#1f77b4", 100)
+            fig_casos = apply_universal_theme(fig_casos, current_theme)
+            return fig_casos
+        fig_casos = figura_em_cache("resumo_casos_ano", casos_por_ano, construir_fig_casos)
+        exibir_figura(fig_casos, use_container_width=True, config={'displayModeBar': False})
     else:
         st.markdown("<div style='height: 100px; display: flex; align-items: center; justify-content: center; color: #666;'><small>Dados de um único ano</small></div>", unsafe_allow_html=True)
 
@@ -536,8 +659,11 @@ with col3:
     
     # Mini gráfico CORRIGIDO
     if len(reaberturas_por_ano) > 1 and reaberturas_por_ano.sum() > 0:
-        fig_reab = create_mini_horizontal_bar(reaberturas_por_ano, "Reaberturas por Ano", "#d62728", 100)
-        st.plotly_chart(fig_reab, use_container_width=True, config={'displayModeBar': False})
+        def construir_fig_reab():
+            fig_reab = create_mini_horizontal_bar(reaberturas_por_ano, "Reaberturas por Ano", "#d62728", 100)
+            return fig_reab
+        fig_reab = figura_em_cache("resumo_reaberturas_ano", reaberturas_por_ano, construir_fig_reab)
+        exibir_figura(fig_reab, use_container_width=True, config={'displayModeBar': False})
     else:
         st.markdown("<div style='height: 100px; display: flex; align-items: center; justify-content: center; color: #666;'><small>Sem dados suficientes</small></div>", unsafe_allow_html=True)
 
@@ -570,303 +696,128 @@ with col4:
     
     # ✅ MELHORADO: Mini gráfico de responsáveis
     if metricas_resp['total_agrupados'] > 1:
-        fig_resp = create_mini_responsaveis_chart_improved(df_filtrado, 100)
-        st.plotly_chart(fig_resp, use_container_width=True, config={'displayModeBar': False})
+        def construir_fig_resp():
+            fig_resp = create_mini_responsaveis_chart_improved(casos_por_responsavel, 100)
+            return fig_resp
+        fig_resp = figura_em_cache("resumo_responsaveis", casos_por_responsavel, construir_fig_resp)
+        exibir_figura(fig_resp, use_container_width=True, config={'displayModeBar': False})
     else:
         st.markdown("<div style='height: 100px; display: flex; align-items: center; justify-content: center; color: #666;'><small>Apenas 1 responsável</small></div>", unsafe_allow_html=True)
 
 st.markdown("---")
 
 # ✅ ESTRUTURA DE ABAS PARA PERFORMANCE (mantendo gráficos originais)
-tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8  = st.tabs([
-    "📊 Casos/Mês", "🏢 Origem", "🔄 Reaberturas", "🏆 Top Contas", "👤 Responsáveis", "📋 Tipos", "📈 Resolubilidade",  "⏱ Tempo Solução"
-])
-
-with tab1:
-    ## 1️⃣ GRÁFICO ORIGINAL - Total de Casos por Mês
-    st.subheader("Total de casos por mês")
-
-    # Código original mantido
-    df_filtrado_copy = df_filtrado.copy().assign(
-        Ano=lambda x: x['Ano'].astype(str),
-        MesNum=lambda x: x['Abertura'].dt.month,
-        MesNome=lambda x: x['Abertura'].dt.strftime('%b')
-    )
-
-    casos_mes = df_filtrado_copy.groupby(['MesNum', 'MesNome', 'Ano']).size().reset_index(name='Total')
-    casos_mes = casos_mes.sort_values(['MesNum', 'Ano'])
-
-    cores_por_ano = {
-        '2023': '#ff7f0e',
-        '2024': '#aec7e8',
-        '2025': '#1f77b4'
-    }
-
-    meses_unicos = casos_mes[['MesNum', 'MesNome']].drop_duplicates().sort_values('MesNum')
-    meses_lista = meses_unicos.to_dict('records')
-
-    barras_x = []
-    barras_y = []
-    barras_cor = []
-    barras_texto = []
-    tickvals = []
-    ticktext = []
-    mes_posicoes = {}
-    contador = 0
-
-    for mes in meses_lista:
-        mes_num = mes['MesNum']
-        mes_nome = mes['MesNome']
-        
-        dados_mes = casos_mes[casos_mes['MesNum'] == mes_num]
-        anos_no_mes = dados_mes['Ano'].unique()
-        
-        inicio_mes = contador
-        
-        for ano in sorted(anos_no_mes):
-            total = dados_mes[dados_mes['Ano'] == ano]['Total'].values[0]
-            
-            barras_x.append(contador)
-            barras_y.append(total)
-            barras_cor.append(cores_por_ano.get(ano, '#333333'))
-            barras_texto.append(str(total))
-            
-            tickvals.append(contador)
-            ticktext.append(ano)
-            
-            contador += 1
-        
-        mes_posicoes[mes_nome] = (inicio_mes + contador - 1) / 2
-        contador += 2
-
-    fig1 = go.Figure()
-
-    fig1.add_trace(go.Bar(
-        x=barras_x,
-        y=barras_y,
-        marker_color=barras_cor,
-        text=barras_texto,
-        textposition='outside',
-        width=0.7
-    ))
-
-    anotacoes = []
-    for mes_nome, pos_central in mes_posicoes.items():
-        anotacoes.append(dict(
-            x=pos_central,
-            y=1.05,
-            xref='x',
-            yref='paper',
-            text=traduzir_mes(mes_nome),
-            showarrow=False,
-            font=dict(size=14, color='white'),
-            xanchor='center'
-        ))
-
-    fig1.update_layout(
-        xaxis=dict(
-            tickmode='array',
-            tickvals=tickvals,
-            ticktext=ticktext,
-            title=None,
-            showgrid=False
-        ),
-        yaxis=dict(
-            title='Total de Casos',
-            gridcolor='rgba(255,255,255,0.1)'
-        ),
-        annotations=anotacoes,
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        font=dict(color='white'),
-        margin=dict(t=80, b=50, l=50, r=50),
-        height=500,
-        bargap=0,
-        bargroupgap=0
-    )
-
-    fig1 = apply_universal_theme(fig1, current_theme)
-    st.plotly_chart(fig1, use_container_width=True)
-
-with tab2:
-    ## 2️⃣ GRÁFICO ORIGINAL - Casos por Origem
-    st.subheader("Casos por origem (Mensal)")
-    
-    df_ordenado = df_filtrado.sort_values("AnoMes")
-    meses_display_ordenados = df_ordenado["AnoMes_Display"].unique()
-    
-    casos_origem = df_filtrado.groupby(["AnoMes", "AnoMes_Display", "Origem"]).size().reset_index(name="Total")
-    casos_origem = casos_origem.sort_values("AnoMes")
-
-    fig2 = px.bar(
-        casos_origem, 
-        x="AnoMes_Display", 
-        y="Total", 
-        color="Origem", 
-        text="Total",
-        barmode='group'
-    )
-    fig2.update_traces(textposition='outside')
-    fig2.update_xaxes(
-        type='category', 
-        categoryorder='array', 
-        categoryarray=meses_display_ordenados,
-        title_text="Mês/Ano"
-    )
-    fig2 = apply_universal_theme(fig2, current_theme)
-    st.plotly_chart(fig2, use_container_width=True)
-
-with tab3:
-    ## 3️⃣ GRÁFICO ORIGINAL - Reaberturas por Mês
-    st.subheader("Reaberturas por mês")
-
-    df_filtrado_copy = df_filtrado.copy().assign(
-        Ano=lambda x: x['Ano'].astype(str),
-        MesNum=lambda x: x['Abertura'].dt.month,
-        MesNome=lambda x: x['Abertura'].dt.strftime('%b')
-    )
-
-    reaberturas_mes = df_filtrado_copy.groupby(['MesNum', 'MesNome', 'Ano'])['Qt Reab.'].sum().reset_index(name='Total')
-    reaberturas_mes['Total'] = reaberturas_mes['Total'].astype(int)
-    reaberturas_mes = reaberturas_mes.sort_values(['MesNum', 'Ano'])
-
-    cores_por_ano = {
-        '2023': '#ff7f0e',
-        '2024': '#aec7e8',
-        '2025': '#1f77b4'
-    }
-
-    meses_unicos = reaberturas_mes[['MesNum', 'MesNome']].drop_duplicates().sort_values('MesNum')
-    meses_lista = meses_unicos.to_dict('records')
-
-    barras_x = []
-    barras_y = []
-    barras_cor = []
-    barras_texto = []
-    tickvals = []
-    ticktext = []
-    mes_posicoes = {}
-    contador = 0
-
-    for mes in meses_lista:
-        mes_num = mes['MesNum']
-        mes_nome = mes['MesNome']
-        
-        dados_mes = reaberturas_mes[reaberturas_mes['MesNum'] == mes_num]
-        anos_no_mes = dados_mes['Ano'].unique()
-        
-        inicio_mes = contador
-        
-        for ano in sorted(anos_no_mes):
-            total = dados_mes[dados_mes['Ano'] == ano]['Total'].values[0]
-            
-            barras_x.append(contador)
-            barras_y.append(total)
-            barras_cor.append(cores_por_ano.get(ano, '#333333'))
-            barras_texto.append(str(total))
-            
-            tickvals.append(contador)
-            ticktext.append(ano)
-            
-            contador += 1
-        
-        mes_posicoes[mes_nome] = (inicio_mes + contador - 1) / 2
-        contador += 2
-
-    fig3 = go.Figure()
-
-    fig3.add_trace(go.Bar(
-        x=barras_x,
-        y=barras_y,
-        marker_color=barras_cor,
-        text=barras_texto,
-        textposition='outside',
-        width=0.7
-    ))
-
-    anotacoes = []
-    for mes_nome, pos_central in mes_posicoes.items():
-        anotacoes.append(dict(
-            x=pos_central,
-            y=1.05,
-            xref='x',
-            yref='paper',
-            text=traduzir_mes(mes_nome),
-            showarrow=False,
-            font=dict(size=14, color='white'),
-            xanchor='center'
-        ))
-
-    fig3.update_layout(
-        xaxis=dict(
-            tickmode='array',
-            tickvals=tickvals,
-            ticktext=ticktext,
-            title=None,
-            showgrid=False
-        ),
-        yaxis=dict(
-            title='Total de Reaberturas',
-            gridcolor='rgba(255,255,255,0.1)'
-        ),
-        annotations=anotacoes,
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        font=dict(color='white'),
-        margin=dict(t=80, b=50, l=50, r=50),
-        height=500,
-        bargap=0,
-        bargroupgap=0
-    )
+# ✅ OTIMIZAÇÃO: Abas sob demanda - só a aba selecionada é calculada e renderizada
+# (ABAS_SOB_DEMANDA=0 volta ao comportamento antigo, com todas as abas a cada rerun)
+ABAS_SOB_DEMANDA = os.environ.get("ABAS_SOB_DEMANDA", "1") != "0"
 
-    fig3 = apply_universal_theme(fig3, current_theme)
-    st.plotly_chart(fig3, use_container_width=True)
+def aba_aberta(aba):
+    """True se a aba deve ser calculada neste rerun (sempre, fora do modo sob demanda)"""
+    return aba.open is not False
 
-with tab4:
-    ## 4️⃣ GRÁFICO ORIGINAL - Top 10 Contas
-    st.subheader("Top 10 contas com mais casos")
-    
-    top_contas = df_filtrado["Conta_Resumida"].value_counts().nlargest(10).reset_index()
-    top_contas.columns = ["Conta", "Total"]
-
-    fig4 = px.bar(
-        top_contas, 
-        x="Conta", 
-        y="Total", 
-        text="Total"
-    )
-    fig4.update_traces(textposition='outside')
-    fig4.update_layout(xaxis={'categoryorder':'total descending'})
-    fig4 = apply_universal_theme(fig4, current_theme)
-    st.plotly_chart(fig4, use_container_width=True)
-
-with tab5:
+tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8  = st.tabs([
+    "📊 Casos/Mês", "🏢 Origem", "🔄 Reaberturas", "🏆 Top Contas", "👤 Responsáveis", "📋 Tipos", "📈 Resolubilidade",  "⏱ Tempo Solução"
+], key="aba_ativa", on_change="rerun" if ABAS_SOB_DEMANDA else "ignore")
+
+with tab1, etapa("aba:casos_mes"):
+    if aba_aberta(tab1):
+        ## 1️⃣ GRÁFICO ORIGINAL - Total de Casos por Mês
+        st.subheader("Total de casos por mês")
+
+        casos_mes = casos_mes_ano(cubo_filtrado)
+
+        def construir_fig1():
+            fig1 = criar_grafico_mes_ano(casos_mes, 'Total de Casos')
+            fig1 = apply_universal_theme(fig1, current_theme)
+            return fig1
+        fig1 = figura_em_cache("casos_mes_ano", casos_mes, construir_fig1)
+        exibir_figura(fig1, use_container_width=True)
+
+with tab2, etapa("aba:origem"):
+    if aba_aberta(tab2):
+        ## 2️⃣ GRÁFICO ORIGINAL - Casos por Origem
+        st.subheader("Casos por origem (Mensal)")
+
+        casos_origem, meses_display_ordenados = casos_mensais_por(cubo_filtrado, "Origem")
+
+        def construir_fig2():
+            fig2 = px.bar(
+                casos_origem,
+                x="AnoMes_Display",
+                y="Total",
+                color="Origem",
+                text="Total",
+                barmode='group'
+            )
+            fig2.update_traces(textposition='outside')
+            fig2.update_xaxes(
+                type='category',
+                categoryorder='array',
+                categoryarray=meses_display_ordenados,
+                title_text="Mês/Ano"
+            )
+            fig2 = apply_universal_theme(fig2, current_theme)
+            return fig2
+        fig2 = figura_em_cache("casos_origem", (casos_origem, meses_display_ordenados), construir_fig2)
+        exibir_figura(fig2, use_container_width=True)
+
+with tab3, etapa("aba:reaberturas"):
+    if aba_aberta(tab3):
+        ## 3️⃣ GRÁFICO ORIGINAL - Reaberturas por Mês
+        st.subheader("Reaberturas por mês")
+
+        reaberturas_mes = reaberturas_mes_ano(cubo_filtrado)
+
+        def construir_fig3():
+            fig3 = criar_grafico_mes_ano(reaberturas_mes, 'Total de Reaberturas')
+            fig3 = apply_universal_theme(fig3, current_theme)
+            return fig3
+        fig3 = figura_em_cache("reaberturas_mes_ano", reaberturas_mes, construir_fig3)
+        exibir_figura(fig3, use_container_width=True)
+
+with tab4, etapa("aba:top_contas"):
+    if aba_aberta(tab4):
+        ## 4️⃣ GRÁFICO ORIGINAL - Top 10 Contas
+        st.subheader("Top 10 contas com mais casos")
+
+        contas = top_contas(df_filtrado, n=10)
+
+        def construir_fig4():
+            fig4 = px.bar(
+                contas,
+                x="Conta",
+                y="Total",
+                text="Total"
+            )
+            fig4.update_traces(textposition='outside')
+            fig4.update_layout(xaxis={'categoryorder':'total descending'})
+            fig4 = apply_universal_theme(fig4, current_theme)
+            return fig4
+        fig4 = figura_em_cache("top_contas", contas, construir_fig4)
+        exibir_figura(fig4, use_container_width=True)
+
+# ✅ OTIMIZAÇÃO: Fragmento - Casos por responsável: o seletor de ano reexecuta só esta aba
+# (reaproveita o cubo filtrado do último rerun completo)
+@st.fragment
+@fragmento_diagnosticado("fragmento:responsaveis")
+def aba_responsaveis(cubo_filtrado):
     ## 5️⃣ GRÁFICO ORIGINAL - Casos por Responsável (COMPLETO)
     st.subheader("Casos por Responsável (Mensal)")
     
-    anos_disponiveis = sorted(df_filtrado["Ano"].unique())
-    ano_selecionado = st.selectbox("Selecione o ano:", anos_disponiveis, index=len(anos_disponiveis)-1)
-    
-    df_ano = (df_filtrado[df_filtrado["Ano"] == ano_selecionado]
-          .copy()
-          .assign(
-              Primeiro_Nome=lambda x: x["Responsável"].str.split().str[0].fillna("Não informado")
-          ))
-    
-    casos_resp = (df_ano.groupby(["AnoMes", "AnoMes_Display", "Primeiro_Nome"])
-                .size()
-                .reset_index(name="Total"))
-    
-    casos_resp = casos_resp.sort_values(["AnoMes", "Total"], ascending=[True, False])
-    
+    anos = anos_disponiveis(cubo_filtrado)
+    ano_selecionado = st.selectbox("Selecione o ano:", anos, index=len(anos)-1)
+
+    casos_resp = casos_responsavel_mes(cubo_filtrado, ano_selecionado)
+    metricas_ano = metricas_responsavel_ano(casos_resp)
+
     # MÉTRICAS RESUMO ORIGINAIS - Centralizadas
     col1, col2, col3, col4 = st.columns(4)
     
-    total_casos = casos_resp["Total"].sum()
-    media_mensal = casos_resp.groupby("AnoMes_Display")["Total"].sum().mean()
-    responsavel_top = casos_resp.groupby("Primeiro_Nome")["Total"].sum().idxmax()
-    casos_top = casos_resp.groupby("Primeiro_Nome")["Total"].sum().max()
-    
+    total_casos = metricas_ano['total_casos']
+    media_mensal = metricas_ano['media_mensal']
+    responsavel_top = metricas_ano['responsavel_top']
+    casos_top = metricas_ano['casos_top']
+
     with col1:
         st.markdown(
             f"""
@@ -916,106 +867,101 @@ with tab5:
     
     colors = ['#3498db', '#e74c3c', '#2ecc71', '#f39c12', '#9b59b6', '#1abc9c', '#e67e22', '#34495e', '#f1c40f', '#95a5a6']
     
-    fig5 = go.Figure()
-    
-    for i, responsavel in enumerate(pivot_data.columns):
-        fig5.add_trace(go.Bar(
-            name=responsavel,
-            x=pivot_data.index,
-            y=pivot_data[responsavel],
-            text=pivot_data[responsavel].astype(int),
-            textposition='outside',
-            marker_color=colors[i % len(colors)],
-            marker_line_color='white',
-            marker_line_width=1,
-            hovertemplate=f'<b>{responsavel}</b><br>Mês: %{{x}}<br>Casos: %{{y}}<extra></extra>'
-        ))
-    
-    max_value = pivot_data.values.max()
-    
-    fig5.update_layout(
-        title={
-            'text': 'Distribuição de Casos por Responsável ao Longo dos Meses',
-            'x': 0.5,
-            'xanchor': 'center',
-            'font': {'size': 18, 'color': 'white', 'family': 'Arial Black'}
-        },
-        xaxis_title="Período",
-        yaxis_title="Número de Casos",
-        barmode='group',
-        height=600,
-        showlegend=True,
-        legend=dict(
-            orientation="h",
-            yanchor="bottom",
-            y=-0.25,
-            xanchor="center",
-            x=0.5,
-            bgcolor="rgba(0,0,0,0)",
-            bordercolor="rgba(255,255,255,0.3)",
-            borderwidth=1,
-            font=dict(color="white")
-        ),
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        font=dict(family="Arial, sans-serif", size=12, color="white"),
-        margin=dict(t=100, b=150, l=60, r=60)
-    )
-    
-    fig5.add_annotation(
-        text=f"🔥 Pico: {int(max_value)} casos",
-        xref="paper", yref="paper",
-        x=0.02, y=0.98,
-        showarrow=False,
-        font=dict(size=12, color="#e74c3c", family="Arial Bold"),
-        bgcolor="rgba(231, 76, 60, 0.1)",
-        bordercolor="#e74c3c",
-        borderwidth=1
-    )
-    
-    fig5.update_xaxes(
-        showgrid=True,
-        gridwidth=1,
-        gridcolor='rgba(128,128,128,0.1)',
-        showline=True,
-        linewidth=2,
-        linecolor='rgba(128,128,128,0.3)',
-        tickangle=0,
-        categoryorder='array',
-        categoryarray=casos_resp.sort_values("AnoMes")["AnoMes_Display"].unique(),
-        tickfont=dict(color="white")
-    )
-    
-    fig5.update_yaxes(
-        showgrid=True,
-        gridwidth=1,
-        gridcolor='rgba(128,128,128,0.1)',
-        showline=True,
-        linewidth=2,
-        linecolor='rgba(128,128,128,0.3)',
-        tickfont=dict(color="white")
-    )
-    
-    fig5 = apply_universal_theme(fig5, current_theme)
-    st.plotly_chart(fig5, use_container_width=True)
+    def construir_fig5():
+        fig5 = go.Figure()
+
+        for i, responsavel in enumerate(pivot_data.columns):
+            fig5.add_trace(go.Bar(
+                name=responsavel,
+                x=pivot_data.index,
+                y=pivot_data[responsavel],
+                text=pivot_data[responsavel].astype(int),
+                textposition='outside',
+                marker_color=colors[i % len(colors)],
+                marker_line_color='white',
+                marker_line_width=1,
+                hovertemplate=f'<b>{responsavel}</b><br>Mês: %{{x}}<br>Casos: %{{y}}<extra></extra>'
+            ))
+
+        max_value = pivot_data.values.max()
+
+        fig5.update_layout(
+            title={
+                'text': 'Distribuição de Casos por Responsável ao Longo dos Meses',
+                'x': 0.5,
+                'xanchor': 'center',
+                'font': {'size': 18, 'color': 'white', 'family': 'Arial Black'}
+            },
+            xaxis_title="Período",
+            yaxis_title="Número de Casos",
+            barmode='group',
+            height=600,
+            showlegend=True,
+            legend=dict(
+                orientation="h",
+                yanchor="bottom",
+                y=-0.25,
+                xanchor="center",
+                x=0.5,
+                bgcolor="rgba(0,0,0,0)",
+                bordercolor="rgba(255,255,255,0.3)",
+                borderwidth=1,
+                font=dict(color="white")
+            ),
+            plot_bgcolor='rgba(0,0,0,0)',
+            paper_bgcolor='rgba(0,0,0,0)',
+            font=dict(family="Arial, sans-serif", size=12, color="white"),
+            margin=dict(t=100, b=150, l=60, r=60)
+        )
+
+        fig5.add_annotation(
+            text=f"🔥 Pico: {int(max_value)} casos",
+            xref="paper", yref="paper",
+            x=0.02, y=0.98,
+            showarrow=False,
+            font=dict(size=12, color="#e74c3c", family="Arial Bold"),
+            bgcolor="rgba(231, 76, 60, 0.1)",
+            bordercolor="#e74c3c",
+            borderwidth=1
+        )
+
+        fig5.update_xaxes(
+            showgrid=True,
+            gridwidth=1,
+            gridcolor='rgba(128,128,128,0.1)',
+            showline=True,
+            linewidth=2,
+            linecolor='rgba(128,128,128,0.3)',
+            tickangle=0,
+            categoryorder='array',
+            categoryarray=casos_resp.sort_values("AnoMes")["AnoMes_Display"].unique(),
+            tickfont=dict(color="white")
+        )
+
+        fig5.update_yaxes(
+            showgrid=True,
+            gridwidth=1,
+            gridcolor='rgba(128,128,128,0.1)',
+            showline=True,
+            linewidth=2,
+            linecolor='rgba(128,128,128,0.3)',
+            tickfont=dict(color="white")
+        )
+
+        fig5 = apply_universal_theme(fig5, current_theme)
+        return fig5
+    fig5 = figura_em_cache("casos_responsavel", casos_resp, construir_fig5)
+    exibir_figura(fig5, use_container_width=True)
     
     # SEÇÕES ORIGINAIS - Análise Detalhada
     with st.expander("📋 Análise Detalhada por Responsável", expanded=False):
-        resumo_responsaveis = casos_resp.groupby("Primeiro_Nome").agg({
-            "Total": ["sum", "mean", "max", "min"]
-        }).round(1)
-        
-        resumo_responsaveis.columns = ["Total Geral", "Média Mensal", "Máximo", "Mínimo"]
-        resumo_responsaveis = resumo_responsaveis.sort_values("Total Geral", ascending=False)
-        
-        resumo_responsaveis["Variação"] = resumo_responsaveis["Máximo"] - resumo_responsaveis["Mínimo"]
-        resumo_responsaveis["% do Total"] = (resumo_responsaveis["Total Geral"] / resumo_responsaveis["Total Geral"].sum() * 100).round(1)
-        
+        resumo_resp = resumo_responsaveis(casos_resp)
+
         def highlight_max(s):
             is_max = s == s.max()
             return ['background-color: teal' if v else '' for v in is_max]
         
-        styled_df = resumo_responsaveis.style.format({
+        styled_df = resumo_resp.style.format({
             "Total Geral": "{:.0f}",
             "Média Mensal": "{:.1f}",
             "Máximo": "{:.0f}",
@@ -1028,189 +974,162 @@ with tab5:
     
     # Ranking Original
     with st.expander("📊 Ranking de Responsáveis", expanded=False):
-        ranking_data = resumo_responsaveis.reset_index()
+        ranking_data = resumo_resp.reset_index()
         
-        fig_ranking = px.bar(
-            ranking_data.head(10),
-            x="Primeiro_Nome",
-            y="Total Geral",
-            text="Total Geral",
-            title=f"Top 10 Responsáveis por Total de Casos em {ano_selecionado}",
-            color="Total Geral",
-            color_continuous_scale="Blues"
-        )
-        
-        fig_ranking.update_traces(
-            textposition='outside',
-            textfont=dict(color='white', size=12, family='Arial Bold')
-        )
-        
-        max_value = ranking_data.head(10)["Total Geral"].max()
-        
-        fig_ranking.update_layout(
-            xaxis_title="Responsável",
-            yaxis_title="Total de Casos",
-            showlegend=False,
-            height=500,
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            margin=dict(t=80, b=60, l=60, r=60),
-            yaxis=dict(range=[0, max_value * 1.15]),
-            font=dict(color='white'),
-            title=dict(
-                font=dict(color='white', size=16),
-                x=0.5,
-                xanchor='center'
+        def construir_fig_ranking():
+            fig_ranking = px.bar(
+                ranking_data.head(10),
+                x="Primeiro_Nome",
+                y="Total Geral",
+                text="Total Geral",
+                title=f"Top 10 Responsáveis por Total de Casos em {ano_selecionado}",
+                color="Total Geral",
+                color_continuous_scale="Blues"
             )
-        )
-        
-        fig_ranking.update_xaxes(tickangle=45, tickfont=dict(color='white'))
-        fig_ranking.update_yaxes(tickfont=dict(color='white'))
 
-        fig_ranking = apply_universal_theme(fig_ranking, current_theme)       
-        st.plotly_chart(fig_ranking, use_container_width=True)
+            fig_ranking.update_traces(
+                textposition='outside',
+                textfont=dict(color='white', size=12, family='Arial Bold')
+            )
 
-with tab6:
-    ## 6️⃣ GRÁFICO ORIGINAL - Casos por Tipo
-    st.subheader("Casos por Tipo (Mensal)")
-    
-    df_ordenado = df_filtrado.sort_values("AnoMes")
-    meses_display_ordenados = df_ordenado["AnoMes_Display"].unique()
-    
-    casos_tipo = df_filtrado.groupby(["AnoMes", "AnoMes_Display", "Tipo"]).size().reset_index(name="Total")
-    casos_tipo = casos_tipo.sort_values("AnoMes")
-
-    fig6 = px.bar(
-        casos_tipo,
-        x="AnoMes_Display",
-        y="Total",
-        color="Tipo",
-        text="Total",
-        title=" ",
-        barmode='group'
-    )
-    fig6.update_traces(textposition='outside')
-    fig6.update_xaxes(
-        type='category',
-        categoryorder='array',
-        categoryarray=meses_display_ordenados,
-        title_text="Mês/Ano"
-    )
-    fig6 = apply_universal_theme(fig6, current_theme)
-    st.plotly_chart(fig6, use_container_width=True)
+            max_value = ranking_data.head(10)["Total Geral"].max()
+
+            fig_ranking.update_layout(
+                xaxis_title="Responsável",
+                yaxis_title="Total de Casos",
+                showlegend=False,
+                height=500,
+                plot_bgcolor='rgba(0,0,0,0)',
+                paper_bgcolor='rgba(0,0,0,0)',
+                margin=dict(t=80, b=60, l=60, r=60),
+                yaxis=dict(range=[0, max_value * 1.15]),
+                font=dict(color='white'),
+                title=dict(
+                    font=dict(color='white', size=16),
+                    x=0.5,
+                    xanchor='center'
+                )
+            )
 
-with tab7:
+            fig_ranking.update_xaxes(tickangle=45, tickfont=dict(color='white'))
+            fig_ranking.update_yaxes(tickfont=dict(color='white'))
+
+            fig_ranking = apply_universal_theme(fig_ranking, current_theme)
+            return fig_ranking
+        fig_ranking = figura_em_cache("ranking_responsaveis", (ranking_data, ano_selecionado), construir_fig_ranking)
+        exibir_figura(fig_ranking, use_container_width=True)
+
+with tab5, etapa("aba:responsaveis"):
+    if aba_aberta(tab5):
+        aba_responsaveis(cubo_filtrado)
+
+with tab6, etapa("aba:tipos"):
+    if aba_aberta(tab6):
+        ## 6️⃣ GRÁFICO ORIGINAL - Casos por Tipo
+        st.subheader("Casos por Tipo (Mensal)")
+
+        casos_tipo, meses_display_ordenados = casos_mensais_por(cubo_filtrado, "Tipo")
+
+        def construir_fig6():
+            fig6 = px.bar(
+                casos_tipo,
+                x="AnoMes_Display",
+                y="Total",
+                color="Tipo",
+                text="Total",
+                title=" ",
+                barmode='group'
+            )
+            fig6.update_traces(textposition='outside')
+            fig6.update_xaxes(
+                type='category',
+                categoryorder='array',
+                categoryarray=meses_display_ordenados,
+                title_text="Mês/Ano"
+            )
+            fig6 = apply_universal_theme(fig6, current_theme)
+            return fig6
+        fig6 = figura_em_cache("casos_tipo", (casos_tipo, meses_display_ordenados), construir_fig6)
+        exibir_figura(fig6, use_container_width=True)
+
+# ✅ OTIMIZAÇÃO: Fragmento - Resolubilidade: o seletor de mês reexecuta só esta aba
+# e trocar o mês é só um recorte da tabela pré-calculada
+@st.fragment
+@fragmento_diagnosticado("fragmento:resolubilidade")
+def aba_resolubilidade(tabela):
     ## 7️⃣ GRÁFICO ORIGINAL - Índice de Resolubilidade
     st.subheader("Índice de Resolubilidade")
 
-    # Criar uma cópia independente com todas as transformações necessárias
-    df_resolubilidade = (
-        df_filtrado
-        .copy()
-        .assign(
-            Resolvido_Mesmo_Dia=lambda x: x["Abertura"] == x["Solução"],
-            Ano=lambda x: x["Abertura"].dt.year,
-            Mes=lambda x: x["Abertura"].dt.month,
-            Mes_Display=lambda x: x["Abertura"].apply(formatar_mes_pt),
-            Mes_Ano_Ordenacao=lambda x: x["Ano"] * 100 + x["Mes"],
-            Primeiro_Nome=lambda x: x["Responsável"].str.split().str[0].fillna("Não informado")
-        )
-    )
-
-    # Ordenar os meses de forma segura (sem modificar o DataFrame original)
-    meses_ordenados = (
-        df_resolubilidade[["Mes_Display", "Mes_Ano_Ordenacao"]]
-        .drop_duplicates()
-        .sort_values("Mes_Ano_Ordenacao")
-    )
-
-    meses_disponiveis = meses_ordenados["Mes_Display"].tolist()
+    meses_disponiveis = meses_resolubilidade(tabela)
     mes_escolhido = st.selectbox("Selecione o mês:", meses_disponiveis, index=len(meses_disponiveis)-1)
 
-    # Filtrar para o mês escolhido
-    df_mes = df_resolubilidade.loc[df_resolubilidade["Mes_Display"] == mes_escolhido].copy()
+    resumo = resolubilidade_mes(tabela, mes_escolhido)
 
-    # Agregações seguras usando groupby
-    total_casos = (
-        df_mes
-        .groupby("Primeiro_Nome", observed=True)
-        .size()
-        .reset_index(name="Total_Casos")
-    )
+    # Criar o gráfico
+    def construir_fig7():
+        fig7 = go.Figure()
 
-    resolvidos_mesmo_dia = (
-        df_mes.loc[df_mes["Resolvido_Mesmo_Dia"]]
-        .groupby("Primeiro_Nome", observed=True)
-        .size()
-        .reset_index(name="Resolvidos_Mesmo_Dia")
-    )
+        x_labels = resumo["Primeiro_Nome"]
 
-    # Merge seguro
-    resumo = (
-        total_casos
-        .merge(
-            resolvidos_mesmo_dia,
-            on="Primeiro_Nome",
-            how="left"
-        )
-        .fillna(0)
-        .assign(
-            Perc_Resolubilidade=lambda x: (x["Resolvidos_Mesmo_Dia"] / x["Total_Casos"]) * 100
-        )
-    )
-
-    # Criar o gráfico
-    fig7 = go.Figure()
+        fig7.add_trace(go.Bar(
+            x=x_labels,
+            y=resumo["Total_Casos"],
+            name="Total de casos",
+            text=resumo["Total_Casos"],
+            textposition="auto"
+        ))
 
-    x_labels = resumo["Primeiro_Nome"]
+        fig7.add_trace(go.Bar(
+            x=x_labels,
+            y=resumo["Resolvidos_Mesmo_Dia"],
+            name="Resolvidos no mesmo dia",
+            text=resumo["Resolvidos_Mesmo_Dia"],
+            textposition="auto"
+        ))
 
-    fig7.add_trace(go.Bar(
-        x=x_labels,
-        y=resumo["Total_Casos"],
-        name="Total de casos",
-        text=resumo["Total_Casos"],
-        textposition="auto"
-    ))
+        fig7.add_trace(go.Scatter(
+            x=x_labels,
+            y=resumo["Perc_Resolubilidade"],
+            name="% Resolubilidade",
+            mode="lines+markers+text",
+            text=[f"{v:.1f}%" for v in resumo["Perc_Resolubilidade"]],
+            textposition="top center",
+            yaxis="y2"
+        ))
 
-    fig7.add_trace(go.Bar(
-        x=x_labels,
-        y=resumo["Resolvidos_Mesmo_Dia"],
-        name="Resolvidos no mesmo dia",
-        text=resumo["Resolvidos_Mesmo_Dia"],
-        textposition="auto"
-    ))
+        fig7.update_layout(
+            title=f"Índice de resolubilidade - {traduzir_mes(mes_escolhido)}",
+            xaxis_title="Responsável",
+            yaxis=dict(title="Quantidade de casos"),
+            yaxis2=dict(title="% Resolubilidade", overlaying="y", side="right"),
+            barmode="group",
+            legend=dict(title="Legenda", x=1.05, y=1),
+            margin=dict(r=100),
+            plot_bgcolor='rgba(0,0,0,0)',
+            paper_bgcolor='rgba(0,0,0,0)',
+            font=dict(color='white')
+        )
 
-    fig7.add_trace(go.Scatter(
-        x=x_labels,
-        y=resumo["Perc_Resolubilidade"],
-        name="% Resolubilidade",
-        mode="lines+markers+text",
-        text=[f"{v:.1f}%" for v in resumo["Perc_Resolubilidade"]],
-        textposition="top center",
-        yaxis="y2"
-    ))
+        fig7 = apply_universal_theme(fig7, current_theme)
+        return fig7
+    fig7 = figura_em_cache("resolubilidade", (resumo, mes_escolhido), construir_fig7)
+    exibir_figura(fig7, use_container_width=True)
 
-    fig7.update_layout(
-        title=f"Índice de resolubilidade - {traduzir_mes(mes_escolhido)}",
-        xaxis_title="Responsável",
-        yaxis=dict(title="Quantidade de casos"),
-        yaxis2=dict(title="% Resolubilidade", overlaying="y", side="right"),
-        barmode="group",
-        legend=dict(title="Legenda", x=1.05, y=1),
-        margin=dict(r=100),
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        font=dict(color='white')
-    )
-    
-    fig7 = apply_universal_theme(fig7, current_theme)
-    st.plotly_chart(fig7, use_container_width=True)
+with tab7, etapa("aba:resolubilidade"):
+    if aba_aberta(tab7):
+        aba_resolubilidade(obter_cache_resolubilidade().obter(
+            dataset.versao, selecao, lambda: tabela_resolubilidade(cubo_filtrado)
+        ))
 
-with tab8:
+# ✅ OTIMIZAÇÃO: Fragmento - Tempo de solução: o seletor de anos reexecuta só esta aba
+# (reaproveita o cubo filtrado do último rerun completo)
+@st.fragment
+@fragmento_diagnosticado("fragmento:tempo_solucao")
+def aba_tempo_solucao(cubo_filtrado, tempos_filtrados):
     st.subheader("⏱ Tempo Médio de Solução de Casos")
     
     # Filtro de anos para esta visualização específica
-    anos_tempo = sorted(df_filtrado["Ano"].dropna().astype(int).unique())
+    anos_tempo = anos_disponiveis(cubo_filtrado)
     anos_sel_tempo = st.multiselect("Selecione os anos para comparar:", 
                                   anos_tempo, 
                                   default=anos_tempo[-2:] if len(anos_tempo) > 1 else anos_tempo,
@@ -1218,74 +1137,58 @@ with tab8:
     
     if not anos_sel_tempo:
         st.warning("Selecione pelo menos um ano para visualizar os dados.")
-        st.stop()
-    
-    # Preparar dados - calcular tempo médio de solução
-    df_tempo = df_filtrado.copy()
-    
-    # Calcular dias para solução (considerando apenas casos resolvidos)
-    df_tempo = df_tempo[df_tempo['Solução'].notna()].copy()
-    df_tempo['Dias_Solucao'] = (df_tempo['Solução'] - df_tempo['Abertura']).dt.days
-    
-    # Agrupar por Ano, Mês e Tipo
-    df_tempo_agrupado = df_tempo.groupby(['Ano', 'AnoMes', 'AnoMes_Display', 'Tipo']).agg(
-        Total_Casos=('Dias_Solucao', 'count'),
-        Soma_Dias=('Dias_Solucao', 'sum')
-    ).reset_index()
-    
-    # Calcular tempo médio
-    df_tempo_agrupado['Tempo_Medio'] = df_tempo_agrupado['Soma_Dias'] / df_tempo_agrupado['Total_Casos']
-    
-    # Filtrar pelos anos selecionados
-    df_tempo_filtrado = df_tempo_agrupado[df_tempo_agrupado['Ano'].isin(anos_sel_tempo)]
+        return
+
+    # ✅ NOVO: Média ou percentis (outliers distorcem a média)
+    metrica = METRICAS_TEMPO[st.radio("Métrica:", list(METRICAS_TEMPO), horizontal=True, key="tempo_metrica")]
+    coluna, titulo = metrica['coluna'], metrica['titulo']
     
+    # ✅ OTIMIZAÇÃO: Estatísticas por (Ano, AnoMes, Tipo) a partir da distribuição de dias do snapshot
+    df_tempo_filtrado = tempo_solucao_mensal(tempos_filtrados, anos_sel_tempo)
+
     if df_tempo_filtrado.empty:
         st.warning("Nenhum dado disponível para os filtros selecionados.")
-        st.stop()
+        return
     
     # Resumo por ano
     st.markdown("### 📅 Resumo Anual")
     
-    # Calcular resumo anual
-    resumo_anual = df_tempo_filtrado.groupby('Ano').agg(
-        Total_Casos=('Total_Casos', 'sum'),
-        Soma_Dias=('Soma_Dias', 'sum')
-    ).reset_index()
-    
-    resumo_anual['Tempo_Medio_Ano'] = resumo_anual['Soma_Dias'] / resumo_anual['Total_Casos']
-    
+    resumo_anual = resumo_anual_tempo(tempos_filtrados, anos_sel_tempo)
+
     # Mostrar métricas de resumo
     cols = st.columns(len(anos_sel_tempo))
     cores = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd', '#8c564b']
     
     for i, (_, row) in enumerate(resumo_anual.iterrows()):
         with cols[i]:
-            # Card Tempo Médio do Ano
+            # Card da métrica no ano
             st.markdown(
                 f"""
                 <div style="text-align: center; padding: 8px; border: 1px solid #333; border-radius: 8px; background: rgba(31, 119, 180, 0.1); height: 80px; display: flex; flex-direction: column; justify-content: center;">
-                    <h5 style="margin: 0; padding: 0; color: #1f77b4; font-size: 14px;">⏱️ Tempo Médio {int(row['Ano'])}</h5>
-                    <h2 style="margin: 2px 0; padding: 0; color: #1f77b4; font-size: 24px;">{row['Tempo_Medio_Ano']:,.2f} dias</h2>
+                    <h5 style="margin: 0; padding: 0; color: #1f77b4; font-size: 14px;">⏱️ {titulo} {int(row['Ano'])}</h5>
+                    <h2 style="margin: 2px 0; padding: 0; color: #1f77b4; font-size: 24px;">{row[coluna]:,.2f} dias</h2>
                 </div>
                 """,
                 unsafe_allow_html=True
             )
 
-            # Filtra dados para o ano atual
-            dados_mini = df_tempo_filtrado[df_tempo_filtrado['Ano'] == row['Ano']].groupby('Tipo').agg(
-                Tempo_Medio=('Tempo_Medio', 'mean')
-            ).reset_index()
+            # Métrica por tipo no ano do card
+            dados_mini = tempo_por_tipo(df_tempo_filtrado, tempos_filtrados, row['Ano'], coluna)
 
             # Se tiver mais de um tipo, exibe mini gráfico
             if len(dados_mini) > 0:
-                fig_tipos = create_mini_horizontal_bar2(
-                    dados_mini,
-                    title="-",  # título vazio pra não mostrar
-                    color="#ff7f0e",
-                    height=150
-                )
-                fig_tipos = apply_universal_theme(fig_tipos, current_theme)
-                st.plotly_chart(fig_tipos, use_container_width=True, config={'displayModeBar': False})
+                def construir_fig_tipos():
+                    fig_tipos = create_mini_horizontal_bar2(
+                        dados_mini,
+                        title="-",  # título vazio pra não mostrar
+                        color="#ff7f0e",
+                        height=150
+                    )
+                    fig_tipos = apply_universal_theme(fig_tipos, current_theme)
+                    return fig_tipos
+                fig_tipos = figura_em_cache("tempo_medio_tipo", dados_mini, construir_fig_tipos)
+                exibir_figura(fig_tipos, use_container_width=True, config={'displayModeBar': False},
+                              key=f"tempo_tipo_{int(row['Ano'])}")
             else:
                 st.markdown("<div style='height: 100px; display: flex; align-items: center; justify-content: center; color: #666;'><small>Sem dados suficientes</small></div>", unsafe_allow_html=True)
 
@@ -1294,87 +1197,58 @@ with tab8:
     st.markdown("---")
     st.markdown("### 📈 Evolução Mensal por Tipo")
     
-    # Ordenar meses corretamente
-    df_tempo_filtrado = df_tempo_filtrado.sort_values(['Ano', 'AnoMes'])
-    df_tempo_filtrado['Tempo_Medio_Label'] = df_tempo_filtrado['Tempo_Medio'].apply(
-        lambda x: f"{x:.2f}".replace('.', ',') if pd.notnull(x) else ''
-    )
-    
+    df_tempo_filtrado = evolucao_tempo_solucao(df_tempo_filtrado, coluna)
+
     # Criar gráfico de linhas com facetas por tipo
-    fig_tempo = px.line(
-        df_tempo_filtrado,
-        x='AnoMes_Display',
-        y='Tempo_Medio',
-        color='Ano',
-        facet_col='Tipo',
-        facet_col_wrap=2,
-        text='Tempo_Medio_Label',
-        labels={
-            'AnoMes_Display': 'Mês/Ano',
-            'Tempo_Medio': 'Tempo Médio (dias)',
-            'Tempo_Medio_Label':'Tempo médio',
-            'Ano': 'Ano'
-        },
-        hover_data={'Tempo_Medio': False, 'Tempo_Medio_Label': True, 'AnoMes_Display': False}, 
-        title='Tempo Médio de Solução por Tipo e Ano',
-        height=600,
-        color_discrete_sequence=cores
-    )
-    
-    # Adicionar pontos para cada mês
-    fig_tempo.update_traces(
-        mode='lines+markers+text',
-        textposition='top center'
-    )                   
-    
-    # Melhorar formatação
-    fig_tempo.update_layout(
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        font=dict(color='white'),
-        margin=dict(t=80, b=80, l=60, r=60),
-        hovermode='x unified'
-    )
-    
-    # Ajustar facetas
-    fig_tempo.for_each_annotation(lambda a: a.update(text=a.text.split("=")[-1]))
-    fig_tempo.update_xaxes(tickangle=45)
-    
-    # Aplicar tema universal
-    fig_tempo = apply_universal_theme(fig_tempo, current_theme)
-    st.plotly_chart(fig_tempo, use_container_width=True)
+    def construir_fig_tempo():
+        fig_tempo = px.line(
+            df_tempo_filtrado,
+            x='AnoMes_Display',
+            y=coluna,
+            color='Ano',
+            facet_col='Tipo',
+            facet_col_wrap=2,
+            text=f'{coluna}_Label',
+            labels={
+                'AnoMes_Display': 'Mês/Ano',
+                coluna: f'{titulo} (dias)',
+                f'{coluna}_Label': titulo.capitalize(),
+                'Ano': 'Ano'
+            },
+            hover_data={coluna: False, f'{coluna}_Label': True, 'AnoMes_Display': False},
+            title=f'{titulo} de Solução por Tipo e Ano',
+            height=600,
+            color_discrete_sequence=cores
+        )
+
+        # Adicionar pontos para cada mês
+        fig_tempo.update_traces(
+            mode='lines+markers+text',
+            textposition='top center'
+        )
+
+        # Melhorar formatação
+        fig_tempo.update_layout(
+            plot_bgcolor='rgba(0,0,0,0)',
+            paper_bgcolor='rgba(0,0,0,0)',
+            font=dict(color='white'),
+            margin=dict(t=80, b=80, l=60, r=60),
+            hovermode='x unified'
+        )
+
+        # Ajustar facetas
+        fig_tempo.for_each_annotation(lambda a: a.update(text=a.text.split("=")[-1]))
+        fig_tempo.update_xaxes(tickangle=45)
+
+        # Aplicar tema universal
+        fig_tempo = apply_universal_theme(fig_tempo, current_theme)
+        return fig_tempo
+    fig_tempo = figura_em_cache("tempo_medio_evolucao", (df_tempo_filtrado, coluna), construir_fig_tempo)
+    exibir_figura(fig_tempo, use_container_width=True)
     
         # Tabela detalhada - Versão Corrigida
     with st.expander("📋 Ver dados detalhados", expanded=False):
-        # Criar tabela pivotada corretamente
-        pivot_table = df_tempo_filtrado.pivot_table(
-            index=['Tipo', 'AnoMes_Display'],
-            columns='Ano',
-            values='Tempo_Medio',
-            aggfunc='mean'
-        ).reset_index()
-        
-        # Extrair apenas o mês da coluna AnoMes_Display
-        pivot_table['Mês'] = pivot_table['AnoMes_Display'].str.split('/').str[0]
-        
-        # Remover a coluna original
-        pivot_table = pivot_table.drop('AnoMes_Display', axis=1)
-        
-        # Agrupar por Tipo e Mês para consolidar
-        pivot_table = pivot_table.groupby(['Tipo', 'Mês']).first().reset_index()
-        
-        # Ordenar os meses corretamente
-        meses_ordem = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun', 
-                      'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
-        pivot_table['Mês'] = pd.Categorical(pivot_table['Mês'], categories=meses_ordem, ordered=True)
-        pivot_table = pivot_table.sort_values(['Tipo', 'Mês'])
-        
-        # Formatar os valores
-        for ano in anos_sel_tempo:
-            if ano in pivot_table.columns:
-                pivot_table[ano] = pivot_table[ano].apply(
-                    lambda x: f"{x:,.2f} dias".replace('.', ',') if pd.notna(x) else "-"
-                )
+        pivot_table = tabela_tempo_solucao(df_tempo_filtrado, anos_sel_tempo, coluna)
 
         # Estilizar a tabela
         def style_table(row):
@@ -1407,4 +1281,11 @@ with tab8:
                     width="small")
                    for ano in anos_sel_tempo}
             }
-        )
\ No newline at end of file
+        )
+
+with tab8, etapa("aba:tempo_solucao"):
+    if aba_aberta(tab8):
+        aba_tempo_solucao(cubo_filtrado, fatiar_tempos(dataset, selecao))
+
+# 🩺 Painel de diagnóstico do rerun (etapas também gravadas em JSON lines)
+finalizar_diagnostico()
@@ -0,0 +1,88 @@
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+@contextmanager
+def arquivo_atomico(caminho, modo='w', encoding=None):
+    """Escreve em um temporário no mesmo diretório e publica com os.replace
+
+    Leitores nunca veem um arquivo pela metade: ou o antigo, ou o novo completo.
+    """
+    diretorio = os.path.dirname(os.path.abspath(caminho))
+    fd, temporario = tempfile.mkstemp(prefix='.tmp-', suffix=os.path.basename(caminho), dir=diretorio)
+    try:
+        with os.fdopen(fd, modo, encoding=encoding) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporario, caminho)
+    finally:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+
+
+def temporario_ao_lado(caminho):
+    """Caminho temporário no mesmo diretório (para os.replace atômico)"""
+    diretorio = os.path.dirname(os.path.abspath(caminho))
+    fd, temporario = tempfile.mkstemp(prefix='.tmp-', suffix=os.path.basename(caminho), dir=diretorio)
+    os.close(fd)
+    return temporario
+
+
+@contextmanager
+def trava_arquivo(caminho):
+    """Trava exclusiva entre processos (e threads) via arquivo de lock"""
+    with open(caminho, 'a+') as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class VooUnico:
+    """Coalesce chamadas simultâneas: só a primeira executa, as demais aguardam o resultado"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._em_voo = {}
+
+    def executar(self, chave, func):
+        with self._lock:
+            voo = self._em_voo.get(chave)
+            lider = voo is None
+            if lider:
+                voo = self._em_voo[chave] = {'evento': threading.Event()}
+
+        if not lider:
+            voo['evento'].wait()
+            if 'erro' in voo:
+                raise voo['erro']
+            return voo['resultado']
+
+        try:
+            voo['resultado'] = func()
+            return voo['resultado']
+        except Exception as e:
+            voo['erro'] = e
+            raise
+        finally:
+            with self._lock:
+                del self._em_voo[chave]
+            voo['evento'].set()
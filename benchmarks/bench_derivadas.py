@@ -0,0 +1,63 @@
+"""Benchmark das colunas derivadas: versão linha a linha vs vetorizada
+
+Uso: python benchmarks/bench_derivadas.py [linhas ...]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ingest import RESPONSAVEIS_OUTROS, calcular_colunas_derivadas, formatar_mes_pt
+
+TAMANHOS_PADRAO = [100_000, 1_000_000, 5_000_000]
+
+
+def derivadas_linha_a_linha(df):
+    """Implementação original (apply por linha), mantida como referência"""
+    df["AnoMes"] = df["Abertura"].dt.strftime('%Y-%m')
+    df["AnoMes_Display"] = df["Abertura"].apply(formatar_mes_pt)
+    df["Ano"] = df["Abertura"].dt.year
+    df["Conta_Resumida"] = df["Conta"].apply(lambda x: ' '.join(x.split()[:2]) if pd.notnull(x) else x)
+    df["Dias_Solucao"] = (df["Solução"] - df["Abertura"]).apply(lambda d: d.days if pd.notnull(d) else np.nan)
+    df['Responsável'] = df['Responsável'].apply(lambda nome: "Outro" if nome in RESPONSAVEIS_OUTROS else nome)
+    return df
+
+
+def gerar_bruto(linhas, seed=0):
+    rng = np.random.default_rng(seed)
+    responsaveis = sorted(RESPONSAVEIS_OUTROS)[:10] + [f"Analista {i} Silva" for i in range(15)]
+    contas = np.array([f"Empresa {i} Comercio Ltda" for i in range(5_000)] + [None], dtype=object)
+    abertura = pd.Timestamp("2022-01-01") + pd.to_timedelta(rng.integers(0, 1_300, linhas), unit="D")
+    # ~10% dos casos ainda em aberto (Solução nula)
+    solucao = pd.Series(abertura + pd.to_timedelta(rng.integers(0, 60, linhas), unit="D"))
+    solucao[rng.random(linhas) < 0.1] = pd.NaT
+    return pd.DataFrame({
+        "Abertura": abertura,
+        "Solução": solucao.values,
+        "Responsável": rng.choice(responsaveis, linhas),
+        "Conta": contas[rng.integers(0, len(contas), linhas)],
+    })
+
+
+def medir(func, df):
+    inicio = time.perf_counter()
+    resultado = func(df.copy())
+    return time.perf_counter() - inicio, resultado
+
+
+def main(tamanhos):
+    print(f"{'linhas':>10} {'linha a linha':>14} {'vetorizado':>11} {'ganho':>7}")
+    for linhas in tamanhos:
+        bruto = gerar_bruto(linhas)
+        t_antigo, antigo = medir(derivadas_linha_a_linha, bruto)
+        t_novo, novo = medir(calcular_colunas_derivadas, bruto)
+        pd.testing.assert_frame_equal(antigo, novo, check_dtype=False)
+        print(f"{linhas:>10,} {t_antigo:>13.2f}s {t_novo:>10.2f}s {t_antigo / t_novo:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main([int(n) for n in sys.argv[1:]] or TAMANHOS_PADRAO)
@@ -0,0 +1,247 @@
+"""Suite de benchmark ponta a ponta do dashboard sobre dados sintéticos
+
+Mede cada etapa isoladamente para cada tamanho pedido:
+
+- parse_xlsx: leitura em streaming da planilha (só até --max-xlsx linhas,
+  escrever planilhas maiores com openpyxl levaria horas)
+- derivadas, hash_linhas, compactar: pipeline de ingestão
+- indice_filtros, opcoes_filtros, cubo, tempos: estruturas montadas uma vez por snapshot
+- filtro:<cenário> (miss/hit no cache de filtros) e cubo:<cenário>
+- facetas:<cenário>: opções e contagens dos filtros em cascata
+- resumo:<cenário> e analise:<cenário>:<aba>: KPIs e agregação de cada aba
+  chamando o pacote analise diretamente, sem Streamlit
+- app:primeira_carga e aba:<nome> (fria = cache de figuras vazio para a aba,
+  quente = rerun com tudo em cache), via AppTest com abas sob demanda;
+  cada rerun inclui o resumo executivo
+
+O resultado é um JSON (uma lista de etapas por execução) para acompanhar
+regressões entre commits.
+
+Uso: python benchmarks/bench_e2e.py --linhas 10000 100000 1000000 --saida resultados.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import pandas as pd  # noqa: E402
+
+import analise  # noqa: E402
+from gerador import gerar_casos, planilha_bruta, salvar_planilha  # noqa: E402
+
+from cubo import CuboCasos, DistribuicaoTempos  # noqa: E402
+from dataset import DatasetCompartilhado  # noqa: E402
+from filtros import CacheFiltros, IndiceFiltros, OpcoesFiltros  # noqa: E402
+from ingest import calcular_colunas_derivadas, hash_linhas, ler_planilha  # noqa: E402
+from schema import compactar_schema  # noqa: E402
+from snapshot_store import COLUNAS_DASHBOARD, salvar_snapshot  # noqa: E402
+
+ABAS = [
+    "📊 Casos/Mês", "🏢 Origem", "🔄 Reaberturas", "🏆 Top Contas",
+    "👤 Responsáveis", "📋 Tipos", "📈 Resolubilidade", "⏱ Tempo Solução",
+]
+
+
+class Medicoes:
+    def __init__(self, linhas):
+        self.linhas = linhas
+        self.etapas = []
+
+    def medir(self, etapa, func, repeticoes=1, **extra):
+        """Executa func `repeticoes` vezes e registra a mediana (retorna o último resultado)"""
+        tempos = []
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            resultado = func()
+            tempos.append(time.perf_counter() - inicio)
+        self.registrar(etapa, statistics.median(tempos), repeticoes=repeticoes, **extra)
+        return resultado
+
+    def registrar(self, etapa, segundos, **extra):
+        """Registra uma etapa (segundos=None quando a etapa foi pulada)"""
+        self.etapas.append({
+            'etapa': etapa, 'linhas': self.linhas,
+            'segundos': None if segundos is None else round(segundos, 6), **extra,
+        })
+        print(f"  {etapa:<32} {'pulado' if segundos is None else f'{segundos:.4f}s':>11}")
+
+
+def _cenarios(df):
+    anos = sorted(df["Ano"].dropna().unique().tolist())
+    origens = df["Origem"].value_counts().index.tolist()
+    responsaveis = df["Responsável"].value_counts().index.tolist()
+    todos = {dim: df[dim].dropna().unique().tolist() for dim in ["Ano", "Origem", "Responsável", "Tipo", "Produto"]}
+    return {
+        'todos': todos,
+        'ultimo_ano': {**todos, "Ano": anos[-1:]},
+        'combinado': {**todos, "Ano": anos[-2:], "Origem": origens[:2], "Responsável": responsaveis[:3]},
+    }
+
+
+def medir_pipeline(m, df_sintetico, max_xlsx, diretorio, repeticoes):
+    if m.linhas <= max_xlsx:
+        caminho = os.path.join(diretorio, f"casos_{m.linhas}.xlsx")
+        salvar_planilha(df_sintetico, caminho)
+        bruto, _ = m.medir('parse_xlsx', lambda: ler_planilha(caminho))
+    else:
+        m.registrar('parse_xlsx', None, pulado=True)
+        bruto = planilha_bruta(df_sintetico)
+
+    derivado = m.medir('derivadas', lambda: calcular_colunas_derivadas(bruto.copy()))
+    m.medir('hash_linhas', lambda: hash_linhas(bruto))
+    df = m.medir('compactar', lambda: compactar_schema(derivado))
+
+    indice = m.medir('indice_filtros', lambda: IndiceFiltros(df))
+    opcoes = m.medir('opcoes_filtros', lambda: OpcoesFiltros(df))
+    m.etapas[-1]['celulas'] = len(opcoes.casos)
+    cubo = m.medir('cubo', lambda: CuboCasos(df))
+    m.etapas[-1]['celulas'] = len(cubo)
+    tempos = m.medir('tempos', lambda: DistribuicaoTempos(df))
+    m.etapas[-1]['celulas'] = len(tempos)
+
+    cache = CacheFiltros()
+    for nome, selecao in _cenarios(df).items():
+        calcular = lambda: indice.aplicar(df, indice.filtrar(selecao))  # noqa: E731
+        filtrado = m.medir(f'filtro:{nome}:miss', lambda: calcular(), repeticoes=repeticoes)
+        cache.obter(1, selecao, calcular)
+        m.medir(f'filtro:{nome}:hit', lambda: cache.obter(1, selecao, calcular), repeticoes=repeticoes,
+                linhas_saida=len(filtrado))
+        m.medir(f'cubo:{nome}', lambda: cubo.fatiar(selecao), repeticoes=repeticoes)
+        excluidos = {dim: sorted(set(opcoes.opcoes[dim]) - set(valores)) for dim, valores in selecao.items()}
+        m.medir(f'facetas:{nome}', lambda: opcoes.facetas(list(selecao), excluidos), repeticoes=repeticoes)
+    return df
+
+
+def _agregacoes_abas(cubo_filtrado, df_filtrado, tempos_filtrados):
+    """Agregação de cada aba no estado inicial (último ano / último mês / dois últimos anos)"""
+    anos = analise.anos_disponiveis(cubo_filtrado)
+    resolubilidade = analise.tabela_resolubilidade(cubo_filtrado)
+    meses = analise.meses_resolubilidade(resolubilidade)
+
+    def responsaveis():
+        casos_resp = analise.casos_responsavel_mes(cubo_filtrado, anos[-1])
+        return analise.metricas_responsavel_ano(casos_resp), analise.resumo_responsaveis(casos_resp)
+
+    def tempo_solucao(coluna='Tempo_Medio'):
+        df_tempo = analise.tempo_solucao_mensal(tempos_filtrados, anos[-2:])
+        analise.resumo_anual_tempo(tempos_filtrados, anos[-2:])
+        for ano in anos[-2:]:
+            analise.tempo_por_tipo(df_tempo, tempos_filtrados, ano, coluna)
+        evolucao = analise.evolucao_tempo_solucao(df_tempo, coluna)
+        return analise.tabela_tempo_solucao(evolucao, anos[-2:], coluna)
+
+    return {
+        ABAS[0]: lambda: analise.casos_mes_ano(cubo_filtrado),
+        ABAS[1]: lambda: analise.casos_mensais_por(cubo_filtrado, "Origem"),
+        ABAS[2]: lambda: analise.reaberturas_mes_ano(cubo_filtrado),
+        ABAS[3]: lambda: analise.top_contas(df_filtrado),
+        ABAS[4]: responsaveis,
+        ABAS[5]: lambda: analise.casos_mensais_por(cubo_filtrado, "Tipo"),
+        ABAS[6]: lambda: analise.resolubilidade_mes(analise.tabela_resolubilidade(cubo_filtrado), meses[-1]),
+        f'{ABAS[6]} (troca de mês)': lambda: analise.resolubilidade_mes(resolubilidade, meses[0]),
+        ABAS[7]: tempo_solucao,
+        f'{ABAS[7]} (p90)': lambda: tempo_solucao('P90'),
+    }
+
+
+def medir_analise(m, df, repeticoes):
+    """KPIs do resumo e agregações das abas via pacote analise (sem Streamlit)"""
+    dataset = DatasetCompartilhado(df, versao=1)
+    analise.preparar_dataset(dataset)
+    for nome, selecao in _cenarios(df).items():
+        df_filtrado = analise.filtrar(dataset, selecao)
+        cubo_filtrado = analise.fatiar_cubo(dataset, selecao)
+        tempos_filtrados = analise.fatiar_tempos(dataset, selecao)
+        m.medir(f'resumo:{nome}', lambda: analise.calcular_resumo(cubo_filtrado), repeticoes=repeticoes)
+        for aba, agregar in _agregacoes_abas(cubo_filtrado, df_filtrado, tempos_filtrados).items():
+            m.medir(f'analise:{nome}:{aba}', agregar, repeticoes=repeticoes)
+
+
+def medir_app(m, df, app, diretorio, repeticoes):
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+
+    # Recursos do st.cache_resource valem para o processo todo: cada tamanho parte do zero
+    st.cache_resource.clear()
+    # Snapshot válido no diretório de trabalho: o app não baixa nem faz parse da planilha
+    cwd = os.getcwd()
+    trabalho = tempfile.mkdtemp(prefix="app-", dir=diretorio)
+    os.chdir(trabalho)
+    os.environ["CASOS_URL"] = "http://127.0.0.1:9/indisponivel.xlsx"
+    os.environ["ABAS_SOB_DEMANDA"] = "1"
+    try:
+        salvar_snapshot(df[[c for c in COLUNAS_DASHBOARD if c in df.columns]])
+        at = AppTest.from_file(os.path.join(RAIZ, app), default_timeout=1800)
+        at.session_state["aba_ativa"] = ABAS[0]
+        m.medir('app:primeira_carga', at.run)
+        for aba in ABAS:
+            at.session_state["aba_ativa"] = aba
+            m.medir(f'aba:{aba}:fria', at.run)
+            m.medir(f'aba:{aba}:quente', at.run, repeticoes=repeticoes)
+            if at.exception:
+                raise RuntimeError(f"{aba}: {at.exception[0].value}")
+    finally:
+        os.chdir(cwd)
+
+
+def _commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=RAIZ,
+                              capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--linhas", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-xlsx", type=int, default=200_000,
+                        help="maior planilha escrita/lida no parse_xlsx")
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--app", default="app.py")
+    parser.add_argument("--sem-app", action="store_true", help="não mede as abas via AppTest")
+    parser.add_argument("--saida", help="arquivo JSON com os resultados")
+    args = parser.parse_args()
+
+    diretorio = tempfile.mkdtemp(prefix="bench-e2e-")
+    execucao = {
+        'inicio': datetime.now().isoformat(timespec='seconds'),
+        'commit': _commit(),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'seed': args.seed,
+        'app': None if args.sem_app else args.app,
+        'etapas': [],
+    }
+
+    for linhas in args.linhas:
+        print(f"{linhas:,} linhas")
+        m = Medicoes(linhas)
+        df_sintetico = m.medir('gerar', lambda: gerar_casos(linhas, seed=args.seed))
+        df = medir_pipeline(m, df_sintetico, args.max_xlsx, diretorio, args.repeticoes)
+        medir_analise(m, df, args.repeticoes)
+        if not args.sem_app:
+            medir_app(m, df, args.app, diretorio, args.repeticoes)
+        execucao['etapas'].extend(m.etapas)
+
+    texto = json.dumps(execucao, ensure_ascii=False, indent=2, default=str)
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            f.write(texto)
+        print(f"resultados -> {args.saida}")
+    else:
+        print(texto)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Micro-benchmark do filtro da sidebar: máscaras isin vs índice invertido
+
+Uso: python benchmarks/bench_filtros.py [linhas ...]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from filtros import DIMENSOES_FILTRO, IndiceFiltros
+
+TAMANHOS_PADRAO = [1_000_000, 5_000_000]
+REPETICOES = 5
+
+
+def gerar(linhas, seed=0):
+    rng = np.random.default_rng(seed)
+    # Distribuição enviesada (Zipf) como nos dados reais de responsáveis/origens
+    def enviesado(valores):
+        pesos = 1 / np.arange(1, len(valores) + 1)
+        return pd.Categorical(rng.choice(valores, linhas, p=pesos / pesos.sum()))
+    return pd.DataFrame({
+        "Ano": rng.choice(np.array([2022, 2023, 2024, 2025], dtype=np.int16), linhas),
+        "Origem": enviesado(["Email", "Telefone", "Portal", "Chat", "WhatsApp"]),
+        "Responsável": enviesado([f"Analista {i}" for i in range(40)]),
+        "Tipo": enviesado(["Dúvida", "Erro", "Melhoria", "Configuração"]),
+        "Produto": enviesado([f"Produto {i}" for i in range(12)]),
+    })
+
+
+def filtro_isin(df, selecao):
+    mascara = np.ones(len(df), dtype=bool)
+    for dim, valores in selecao.items():
+        mascara &= df[dim].isin(valores).values
+    return df[mascara]
+
+
+def cenarios(df):
+    todos = {dim: sorted(df[dim].unique()) for dim in DIMENSOES_FILTRO}
+    return {
+        "tudo marcado": todos,
+        "um ano": {**todos, "Ano": [2024]},
+        "um responsável": {**todos, "Responsável": ["Analista 7"]},
+        "ano + origem + tipo": {**todos, "Ano": [2025], "Origem": ["Chat"], "Tipo": ["Erro"]},
+        "responsável raro + produto": {**todos, "Responsável": ["Analista 39"], "Produto": ["Produto 3"]},
+    }
+
+
+def cronometrar(func):
+    tempos = []
+    for _ in range(REPETICOES):
+        inicio = time.perf_counter()
+        resultado = func()
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos), resultado
+
+
+def main(tamanhos):
+    for linhas in tamanhos:
+        df = gerar(linhas)
+        inicio = time.perf_counter()
+        indice = IndiceFiltros(df)
+        construcao = time.perf_counter() - inicio
+        print(f"\n{linhas:,} linhas - índice construído em {construcao:.2f}s ({indice.nbytes / 1e6:.0f} MB)")
+        print(f"{'cenário':<28} {'linhas':>10} {'isin':>9} {'índice':>9} {'ganho':>7}")
+        for nome, selecao in cenarios(df).items():
+            t_isin, esperado = cronometrar(lambda: filtro_isin(df, selecao))
+            t_indice, obtido = cronometrar(lambda: indice.aplicar(df, indice.filtrar(selecao)))
+            pd.testing.assert_frame_equal(esperado, obtido)
+            print(f"{nome:<28} {len(obtido):>10,} {t_isin * 1e3:>7.1f}ms {t_indice * 1e3:>7.1f}ms "
+                  f"{t_isin / t_indice:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main([int(n) for n in sys.argv[1:]] or TAMANHOS_PADRAO)
@@ -0,0 +1,107 @@
+"""Benchmark: rerun completo x rerun do fragmento ao trocar um seletor de aba
+
+Roda o app via AppTest com a aba escolhida aberta e alterna o seletor local
+(ano na aba de responsáveis, mês na resolubilidade, anos no tempo de solução).
+"Completo" é o rerun do script inteiro (comportamento sem fragmentos);
+"fragmento" injeta o id do fragmento no pedido de rerun, como o navegador
+faz quando um widget dentro de um @st.fragment muda.
+
+Uso: python benchmarks/bench_fragmentos.py [app.py|app1.py] [linhas] [repeticoes]
+"""
+import functools
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from stress_loader import gerar_planilha  # noqa: E402
+
+import streamlit.testing.v1.local_script_runner as local_script_runner  # noqa: E402
+from streamlit.runtime.scriptrunner_utils.script_requests import RerunData  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+# aba -> (tipo de widget, chave ou índice entre os widgets daquele tipo)
+SELETORES = {
+    "👤 Responsáveis": ("selectbox", 0),
+    "📈 Resolubilidade": ("selectbox", 0),
+    "⏱ Tempo Solução": ("multiselect", "tempo_anos"),
+}
+
+_fragmento = {"id": None}
+
+
+def _rerun_data(**kwargs):
+    if _fragmento["id"] is not None:
+        return RerunData(fragment_id=_fragmento["id"], **kwargs)
+    return RerunData(**kwargs)
+
+
+class _Silencioso(SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+def _valores(widget, tipo):
+    opcoes = list(widget.options)
+    if tipo == "multiselect":
+        return [opcoes[-1:], opcoes[-2:]]
+    return [opcoes[-1], opcoes[0]]
+
+
+def medir(app, aba, repeticoes):
+    tipo, seletor = SELETORES[aba]
+    at = AppTest.from_file(os.path.join(RAIZ, app), default_timeout=600)
+    at.session_state["aba_ativa"] = aba
+    at.run()
+
+    tempos = {}
+    for modo in ("completo", "fragmento"):
+        fragmentos = list(at._fragment_storage._fragments)
+        _fragmento["id"] = fragmentos[0] if modo == "fragmento" and len(fragmentos) == 1 else None
+        amostras = []
+        for i in range(repeticoes):
+            widgets = getattr(at, tipo)
+            widget = widgets(key=seletor) if isinstance(seletor, str) else widgets[seletor]
+            valor = _valores(widget, tipo)[i % 2]
+            inicio = time.perf_counter()
+            widget.set_value(valor)
+            at.run()
+            amostras.append(time.perf_counter() - inicio)
+            if at.exception:
+                raise RuntimeError(at.exception[0].value)
+        _fragmento["id"] = None
+        tempos[modo] = statistics.median(amostras)
+    return tempos
+
+
+def main(app="app.py", linhas=50_000, repeticoes=7):
+    diretorio = tempfile.mkdtemp(prefix="bench-fragmentos-")
+    gerar_planilha(os.path.join(diretorio, "origem.xlsx"), linhas)
+    servidor = ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(_Silencioso, directory=diretorio))
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    os.environ["CASOS_URL"] = f"http://127.0.0.1:{servidor.server_port}/origem.xlsx"
+    local_script_runner.RerunData = _rerun_data
+    os.chdir(diretorio)
+
+    print(f"{app} · {linhas:,} linhas · mediana de {repeticoes} reruns")
+    print(f"{'aba':<20} {'completo (s)':>13} {'fragmento (s)':>14} {'ganho':>7}")
+    for aba in SELETORES:
+        tempos = medir(app, aba, repeticoes)
+        ganho = tempos["completo"] / tempos["fragmento"]
+        print(f"{aba:<20} {tempos['completo']:>13.3f} {tempos['fragmento']:>14.3f} {ganho:>6.1f}x")
+    servidor.shutdown()
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(
+        args[0] if len(args) > 0 else "app.py",
+        int(args[1]) if len(args) > 1 else 50_000,
+        int(args[2]) if len(args) > 2 else 7,
+    )
@@ -0,0 +1,82 @@
+"""Benchmark: ingestão incremental vs completa por taxa de alteração
+
+Parte de um snapshot compactado (como o loader lê do disco), altera uma
+fração das linhas da planilha (edições no lugar + linhas novas no fim) e
+mede `mesclar_incremental` contra `preparar_completo` sobre a mesma
+planilha. O cenário "remoção no início" desloca todas as linhas, o pior
+caso para o casamento por posição. O resultado do incremental é conferido
+contra o completo antes de medir.
+
+Uso: python benchmarks/bench_incremental.py [linhas] [repeticoes]
+"""
+import os
+import statistics
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from gerador import gerar_casos, planilha_bruta  # noqa: E402
+
+from ingest import mesclar_incremental, preparar_completo  # noqa: E402
+from schema import compactar_schema  # noqa: E402
+
+
+def alterar(bruto, taxa, seed=1):
+    """Edita `taxa` das linhas no lugar e acrescenta outro tanto de linhas novas no fim"""
+    rng = np.random.default_rng(seed)
+    n = max(1, int(len(bruto) * taxa / 2))
+    novo = bruto.copy()
+    editadas = rng.choice(len(novo), n, replace=False)
+    novo.loc[novo.index[editadas], "Qt Reab."] = novo["Qt Reab."].iloc[editadas] + 1
+    novas = planilha_bruta(gerar_casos(n, seed=seed))
+    return pd.concat([novo, novas], ignore_index=True)
+
+
+def _conferir(completo, incremental):
+    completo, incremental = compactar_schema(completo), compactar_schema(incremental)
+    for col in completo.columns:
+        esperado, obtido = completo[col], incremental[col]
+        if isinstance(esperado.dtype, pd.CategoricalDtype):
+            esperado, obtido = esperado.astype(object), obtido.astype(object)
+        pd.testing.assert_series_equal(esperado, obtido, check_dtype=False, check_names=False)
+
+
+def _mediana(func, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = func()
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos), resultado
+
+
+def main(linhas=1_000_000, repeticoes=3):
+    bruto = planilha_bruta(gerar_casos(linhas))
+    anterior = compactar_schema(preparar_completo(bruto.copy()))
+
+    cenarios = {f"{taxa:.1%}": alterar(bruto, taxa) for taxa in (0.001, 0.01, 0.1)}
+    cenarios["remoção no início"] = bruto.iloc[10:].reset_index(drop=True)
+
+    print(f"{linhas:,} linhas · mediana de {repeticoes} execuções (s)")
+    print(f"{'cenário':<18} {'completo':>9} {'incremental':>12} {'modo':>12} {'ganho':>7}")
+    for nome, planilha in cenarios.items():
+        t_completo, completo = _mediana(lambda: preparar_completo(planilha.copy()), repeticoes)
+        t_incremental, (incremental, delta) = _mediana(
+            lambda: mesclar_incremental(anterior, planilha.copy()), repeticoes
+        )
+        _conferir(completo, incremental)
+        print(f"{nome:<18} {t_completo:>9.3f} {t_incremental:>12.3f} {delta['modo']:>12} "
+              f"{t_completo / t_incremental:>6.1f}x")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(
+        int(args[0]) if len(args) > 0 else 1_000_000,
+        int(args[1]) if len(args) > 1 else 3,
+    )
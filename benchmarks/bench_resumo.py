@@ -0,0 +1,135 @@
+"""Benchmark: custo por rerun dos KPIs do "📊 Resumo"
+
+Compara, para cada cenário de filtro, três formas de calcular os cards e as
+séries dos mini gráficos:
+
+- linhas: código original sobre o df_filtrado (cópia em df_work, dois
+  groupby por ano, máscaras de mês/ano e varreduras de Responsável)
+- cubo_groupby: os mesmos groupbys sobre o cubo filtrado
+- kernel: analise.calcular_resumo (códigos + bincount, uma passada)
+
+O resultado do kernel é conferido contra o cubo_groupby antes de medir.
+
+Uso: python benchmarks/bench_resumo.py [linhas] [repeticoes]
+"""
+import os
+import statistics
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import pandas as pd  # noqa: E402
+
+from gerador import gerar_casos, planilha_bruta  # noqa: E402
+
+from analise import (  # noqa: E402
+    calcular_metricas_responsaveis, calcular_resumo, fatiar_cubo, filtrar, preparar_dataset,
+)
+from dataset import DatasetCompartilhado  # noqa: E402
+from ingest import calcular_colunas_derivadas, formatar_mes_pt  # noqa: E402
+from schema import compactar_schema  # noqa: E402
+
+
+def resumo_linhas(df_filtrado):
+    """KPIs como o app calculava sobre as linhas filtradas"""
+    total_casos = len(df_filtrado)
+    df_work = df_filtrado.copy()
+    df_work.loc[:, 'Ano_Int'] = df_work['Ano'].astype(int)
+    casos_por_ano = df_work.groupby('Ano_Int').size().sort_index()
+
+    ultimo_mes_dados = df_filtrado['Abertura'].max()
+    casos_mes_atual = len(df_filtrado[
+        (df_filtrado['Abertura'].dt.month == ultimo_mes_dados.month) &
+        (df_filtrado['Abertura'].dt.year == ultimo_mes_dados.year)
+    ])
+
+    responsavel = df_filtrado['Responsável']
+    tem_outros = 'Outro' in responsavel.values
+    return {
+        'total_casos': total_casos,
+        'casos_por_ano': casos_por_ano,
+        'casos_mes_atual': casos_mes_atual,
+        'mes_atual_nome': formatar_mes_pt(ultimo_mes_dados),
+        'total_reaberturas': df_filtrado['Qt Reab.'].sum(),
+        'reaberturas_por_ano': df_work.groupby('Ano_Int')['Qt Reab.'].sum().sort_index(),
+        'casos_por_responsavel': responsavel.value_counts(),
+        'metricas_resp': {
+            'total_agrupados': responsavel.nunique(),
+            'principais': responsavel[responsavel != 'Outro'].nunique() if tem_outros else responsavel.nunique(),
+            'casos_outros': len(df_filtrado[responsavel == 'Outro']),
+            'tem_outros': tem_outros,
+        },
+    }
+
+
+def resumo_cubo_groupby(cubo_filtrado):
+    """KPIs com groupbys sobre o cubo filtrado"""
+    total_casos = int(cubo_filtrado['Casos'].sum())
+    cubo_work = cubo_filtrado.assign(Ano_Int=cubo_filtrado['Ano'].astype(int))
+    casos_por_mes = cubo_filtrado.groupby(['AnoMes', 'AnoMes_Display'], observed=True)['Casos'].sum()
+    casos_por_responsavel = cubo_filtrado.groupby('Responsável', observed=True)['Casos'].sum()
+    return {
+        'total_casos': total_casos,
+        'casos_por_ano': cubo_work.groupby('Ano_Int')['Casos'].sum().sort_index(),
+        'casos_mes_atual': int(casos_por_mes.iloc[-1]),
+        'mes_atual_nome': casos_por_mes.index[-1][1],
+        'total_reaberturas': cubo_filtrado['Reaberturas'].sum(),
+        'reaberturas_por_ano': cubo_work.groupby('Ano_Int')['Reaberturas'].sum().sort_index(),
+        'casos_por_responsavel': casos_por_responsavel,
+        'metricas_resp': calcular_metricas_responsaveis(casos_por_responsavel, total_casos),
+    }
+
+
+def _conferir(esperado, obtido):
+    for chave, valor in esperado.items():
+        if isinstance(valor, pd.Series):
+            assert list(valor.index) == list(obtido[chave].index), chave
+            assert list(valor.values) == list(obtido[chave].values), chave
+        else:
+            assert valor == obtido[chave], (chave, valor, obtido[chave])
+
+
+def _mediana(func, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        func()
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos)
+
+
+def main(linhas=200_000, repeticoes=21):
+    df = compactar_schema(calcular_colunas_derivadas(planilha_bruta(gerar_casos(linhas))))
+    dataset = DatasetCompartilhado(df, versao=1)
+    preparar_dataset(dataset)
+
+    anos = sorted(df["Ano"].unique().tolist())
+    responsaveis = df["Responsável"].value_counts().index.tolist()
+    cenarios = {
+        'todos': {},
+        'ultimo_ano': {"Ano": anos[-1:]},
+        'combinado': {"Ano": anos[-2:], "Responsável": responsaveis[:3]},
+    }
+
+    print(f"{linhas:,} linhas · mediana de {repeticoes} execuções (ms)")
+    print(f"{'cenário':<12} {'linhas':>9} {'cubo_groupby':>13} {'kernel':>8} {'ganho':>7}")
+    for nome, selecao in cenarios.items():
+        df_filtrado = filtrar(dataset, selecao)
+        cubo_filtrado = fatiar_cubo(dataset, selecao)
+        _conferir(resumo_cubo_groupby(cubo_filtrado), calcular_resumo(cubo_filtrado))
+
+        t_linhas = _mediana(lambda: resumo_linhas(df_filtrado), repeticoes)
+        t_cubo = _mediana(lambda: resumo_cubo_groupby(cubo_filtrado), repeticoes)
+        t_kernel = _mediana(lambda: calcular_resumo(cubo_filtrado), repeticoes)
+        print(f"{nome:<12} {t_linhas * 1000:>9.2f} {t_cubo * 1000:>13.2f} {t_kernel * 1000:>8.2f} "
+              f"{t_linhas / t_kernel:>6.0f}x")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(
+        int(args[0]) if len(args) > 0 else 200_000,
+        int(args[1]) if len(args) > 1 else 21,
+    )
@@ -0,0 +1,97 @@
+"""Gerador sintético de casos com o schema exato da planilha
+
+Colunas: Abertura, Solução, Origem, Responsável, Tipo, Produto, Conta, Qt Reab.
+As distribuições são assimétricas como na base real: poucos responsáveis e
+contas concentram a maior parte dos casos (Zipf), o volume cresce ao longo
+do período e cai nos fins de semana, boa parte dos casos é resolvida no
+mesmo dia, uma fração fica em aberto e reaberturas são raras.
+
+Uso: python benchmarks/gerador.py linhas saida.xlsx [seed]
+"""
+import sys
+
+import numpy as np
+import pandas as pd
+
+ORIGENS = (["Email", "Telefone", "Portal", "Chat", "WhatsApp"], [0.35, 0.25, 0.2, 0.15, 0.05])
+TIPOS = (["Dúvida", "Erro", "Melhoria", "Configuração", "Treinamento", "Financeiro"],
+         [0.4, 0.25, 0.12, 0.1, 0.08, 0.05])
+PRODUTOS = (["ERP", "Fiscal", "Folha", "PDV", "BI", "Mobile", "Web", "Integrações"],
+            [0.3, 0.2, 0.15, 0.12, 0.08, 0.06, 0.05, 0.04])
+
+# Nomes do grupo "Outro" (ingest.RESPONSAVEIS_OUTROS) aparecem na cauda
+RESPONSAVEIS_PRINCIPAIS = [
+    "Ana Souza", "Bruno Lima", "Carla Dias", "Diego Rocha", "Elisa Martins",
+    "Fábio Nunes", "Gabriela Costa", "Heitor Alves", "Isabela Ramos", "Júlio Pereira",
+]
+RESPONSAVEIS_CAUDA = ["Marlon De Bem", "Fabiana Bressan", "Ramiriz Leal", "Susan Carboni", "Outro"]
+
+PREFIXOS_CONTA = ["Comercial", "Distribuidora", "Indústria", "Mercado", "Farmácia", "Transportes",
+                  "Construtora", "Auto Peças", "Padaria", "Clínica", "Supermercado", "Papelaria"]
+
+
+def _zipf(rng, n, linhas, expoente=1.1):
+    """Índices 0..n-1 com probabilidade proporcional a 1 / (posição ** expoente)"""
+    pesos = 1.0 / np.arange(1, n + 1) ** expoente
+    return rng.choice(n, size=linhas, p=pesos / pesos.sum())
+
+
+def _categoria(rng, valores_pesos, linhas):
+    valores, pesos = valores_pesos
+    return pd.Categorical.from_codes(
+        rng.choice(len(valores), size=linhas, p=np.asarray(pesos) / np.sum(pesos)), categories=valores
+    )
+
+
+def gerar_casos(linhas, seed=0, inicio="2023-01-01", fim="2025-06-30", contas=None):
+    """DataFrame sintético de casos (determinístico para a mesma seed)"""
+    rng = np.random.default_rng(seed)
+    dias = pd.date_range(inicio, fim, freq="D")
+
+    # Volume diário: tendência de crescimento e fins de semana mais fracos
+    tendencia = np.linspace(0.6, 1.4, len(dias))
+    sazonal = np.where(dias.dayofweek >= 5, 0.25, 1.0)
+    pesos_dias = tendencia * sazonal
+    abertura = dias[rng.choice(len(dias), size=linhas, p=pesos_dias / pesos_dias.sum())]
+
+    # Solução: ~35% no mesmo dia, cauda longa (log-normal) e ~7% ainda em aberto
+    atraso = np.where(rng.random(linhas) < 0.35, 0, np.ceil(rng.lognormal(1.0, 1.0, linhas)))
+    solucao = pd.Series(abertura + pd.to_timedelta(atraso, unit="D"))
+    solucao[rng.random(linhas) < 0.07] = pd.NaT
+
+    nomes = RESPONSAVEIS_PRINCIPAIS + RESPONSAVEIS_CAUDA
+    responsavel = pd.Categorical.from_codes(_zipf(rng, len(nomes), linhas, 0.8), categories=nomes)
+
+    n_contas = contas or max(50, min(20_000, linhas // 50))
+    nomes_contas = [
+        f"{PREFIXOS_CONTA[i % len(PREFIXOS_CONTA)]} Cliente{i:05d} Ltda" for i in range(n_contas)
+    ]
+    conta = pd.Categorical.from_codes(_zipf(rng, n_contas, linhas, 1.05), categories=nomes_contas)
+
+    return pd.DataFrame({
+        "Abertura": abertura,
+        "Solução": solucao.values,
+        "Origem": _categoria(rng, ORIGENS, linhas),
+        "Responsável": responsavel,
+        "Tipo": _categoria(rng, TIPOS, linhas),
+        "Produto": _categoria(rng, PRODUTOS, linhas),
+        "Conta": conta,
+        "Qt Reab.": rng.poisson(0.15, linhas),
+    })
+
+
+def planilha_bruta(df):
+    """Mesmos dados como a leitura da planilha devolve (texto em vez de categorias)"""
+    return df.astype({col: object for col in df.columns if isinstance(df[col].dtype, pd.CategoricalDtype)})
+
+
+def salvar_planilha(df, caminho):
+    planilha_bruta(df).to_excel(caminho, index=False)
+
+
+if __name__ == "__main__":
+    linhas = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    saida = sys.argv[2] if len(sys.argv) > 2 else "casos_sinteticos.xlsx"
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    salvar_planilha(gerar_casos(linhas, seed), saida)
+    print(f"{linhas:,} linhas -> {saida}")
@@ -0,0 +1,104 @@
+"""Teste de estresse do loader: vários processos x threads com cache frio
+
+Sobe um servidor HTTP local com a planilha, dispara todos os loaders ao mesmo
+tempo e verifica que houve exatamente um download e que todos os resultados
+são idênticos.
+
+Uso: python benchmarks/stress_loader.py [processos] [threads] [linhas]
+"""
+import functools
+import multiprocessing as mp
+import os
+import sys
+import tempfile
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+
+class ContadorHandler(SimpleHTTPRequestHandler):
+    downloads = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        with ContadorHandler.lock:
+            ContadorHandler.downloads += 1
+        super().do_GET()
+
+    def log_message(self, *args):
+        pass
+
+
+def gerar_planilha(caminho, linhas, seed=0):
+    rng = np.random.default_rng(seed)
+    abertura = pd.Timestamp("2023-01-01") + pd.to_timedelta(rng.integers(0, 900, linhas), unit="D")
+    pd.DataFrame({
+        "Abertura": abertura,
+        "Solução": abertura + pd.to_timedelta(rng.integers(0, 10, linhas), unit="D"),
+        "Origem": rng.choice(["Email", "Telefone", "Portal"], linhas),
+        "Responsável": rng.choice(["Ana Souza", "Bruno Lima", "Marlon De Bem"], linhas),
+        "Tipo": rng.choice(["Dúvida", "Erro"], linhas),
+        "Produto": rng.choice(["A", "B"], linhas),
+        "Conta": rng.choice(["Empresa Alfa Ltda", "Beta Comercio SA"], linhas),
+        "Qt Reab.": rng.integers(0, 3, linhas),
+    }).to_excel(caminho, index=False)
+
+
+def _worker(diretorio, threads, barreira, fila):
+    os.chdir(diretorio)
+    from loader import carregar_dados
+
+    resultados, erros = [], []
+
+    def chamar():
+        barreira.wait()
+        try:
+            resultados.append(len(carregar_dados()))
+        except Exception as e:
+            erros.append(repr(e))
+
+    ts = [threading.Thread(target=chamar) for _ in range(threads)]
+    for t in ts:
+        t.start()
+    for t in ts:
+        t.join()
+    fila.put((resultados, erros))
+
+
+def main(processos=8, threads=8, linhas=20_000):
+    diretorio = tempfile.mkdtemp(prefix="stress-loader-")
+    gerar_planilha(os.path.join(diretorio, "origem.xlsx"), linhas)
+
+    servidor = ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(ContadorHandler, directory=diretorio))
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    os.environ["CASOS_URL"] = f"http://127.0.0.1:{servidor.server_port}/origem.xlsx"
+
+    ctx = mp.get_context("spawn")
+    barreira = ctx.Barrier(processos * threads)
+    fila = ctx.Queue()
+    procs = [ctx.Process(target=_worker, args=(diretorio, threads, barreira, fila)) for _ in range(processos)]
+    for p in procs:
+        p.start()
+    saidas = [fila.get() for _ in procs]
+    for p in procs:
+        p.join()
+    servidor.shutdown()
+
+    resultados = [r for rs, _ in saidas for r in rs]
+    erros = [e for _, es in saidas for e in es]
+    print(f"loaders: {processos * threads}  downloads: {ContadorHandler.downloads}  "
+          f"erros: {len(erros)}  linhas distintas: {sorted(set(resultados))}")
+
+    assert not erros, erros
+    assert ContadorHandler.downloads == 1, ContadorHandler.downloads
+    assert resultados and set(resultados) == {linhas}, set(resultados)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:]])
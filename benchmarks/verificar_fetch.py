@@ -0,0 +1,109 @@
+"""Verificação da busca condicional (fetch.baixar_se_alterado)
+
+Sobe um servidor HTTP local que responde com ETag/Last-Modified e 304 para
+validadores iguais e confere, em sequência, os motivos e os contadores de
+hits/misses gravados em fetch_state.json:
+
+1. primeira busca: download (miss)
+2. mesma planilha, servidor com validadores: not-modified (hit)
+3. mesma planilha, servidor ignorando validadores: hash-igual (hit)
+4. planilha alterada: download (miss)
+
+Uso: python benchmarks/verificar_fetch.py
+"""
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from fetch import baixar_se_alterado  # noqa: E402
+
+
+class PlanilhaHandler(BaseHTTPRequestHandler):
+    conteudo = b""
+    modificado_em = 0.0
+    usar_validadores = True
+    respostas = []
+
+    def do_GET(self):
+        etag = '"' + hashlib.md5(self.conteudo).hexdigest() + '"'
+        ultima_modificacao = formatdate(self.modificado_em, usegmt=True)
+        if self.usar_validadores and (
+            self.headers.get('If-None-Match') == etag
+            or self.headers.get('If-Modified-Since') == ultima_modificacao
+        ):
+            PlanilhaHandler.respostas.append(304)
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        PlanilhaHandler.respostas.append(200)
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
+        self.send_header('Content-Length', str(len(self.conteudo)))
+        if self.usar_validadores:
+            self.send_header('ETag', etag)
+            self.send_header('Last-Modified', ultima_modificacao)
+        self.end_headers()
+        self.wfile.write(self.conteudo)
+
+    def log_message(self, *args):
+        pass
+
+
+def _publicar(conteudo, modificado_em):
+    PlanilhaHandler.conteudo = conteudo
+    PlanilhaHandler.modificado_em = modificado_em
+
+
+def main():
+    servidor = ThreadingHTTPServer(('127.0.0.1', 0), PlanilhaHandler)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{servidor.server_port}/casos.xlsx"
+
+    diretorio = tempfile.mkdtemp(prefix="fetch-")
+    destino = os.path.join(diretorio, 'temp_file.xlsx')
+    estado_caminho = os.path.join(diretorio, 'fetch_state.json')
+
+    passos = [
+        ("primeira busca", b"planilha v1", 1_700_000_000, True, True, 'download', 200),
+        ("validadores iguais", b"planilha v1", 1_700_000_000, True, False, 'not-modified', 304),
+        ("sem validadores", b"planilha v1", 1_700_000_000, False, False, 'hash-igual', 200),
+        ("planilha alterada", b"planilha v2", 1_700_000_600, True, True, 'download', 200),
+    ]
+    falhas = 0
+    try:
+        for nome, conteudo, modificado_em, validadores, alterado, motivo, status in passos:
+            _publicar(conteudo, modificado_em)
+            PlanilhaHandler.usar_validadores = validadores
+            PlanilhaHandler.respostas = []
+            resultado = baixar_se_alterado(url, destino, estado_caminho=estado_caminho)
+            with open(destino, 'rb') as f:
+                em_disco = f.read()
+            ok = (resultado == {'alterado': alterado, 'motivo': motivo}
+                  and PlanilhaHandler.respostas == [status] and em_disco == conteudo)
+            falhas += not ok
+            print(f"  {nome:<20} {resultado['motivo']:<13} HTTP {PlanilhaHandler.respostas} "
+                  f"{'ok' if ok else 'FALHOU'}")
+
+        with open(estado_caminho, encoding='utf-8') as f:
+            estado = json.load(f)
+        contadores_ok = estado['hits'] == 2 and estado['misses'] == 2
+        falhas += not contadores_ok
+        print(f"  fetch_state.json: {estado['hits']} hits / {estado['misses']} misses "
+              f"{'ok' if contadores_ok else 'FALHOU (esperado 2 / 2)'}")
+    finally:
+        servidor.shutdown()
+
+    sys.exit(1 if falhas else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+import numpy as np
+import pandas as pd
+
+from filtros import IndiceFiltros
+
+# Grão do cubo; Ano e Mes dependem de AnoMes (e AnoMes_Display também),
+# então não aumentam o número de células
+DIMENSOES_CUBO = ["AnoMes", "AnoMes_Display", "Ano", "Mes", "Origem", "Responsável", "Tipo", "Produto"]
+
+# Medidas aditivas: qualquer recorte do cubo é somado sem voltar às linhas
+MEDIDAS_CUBO = ["Casos", "Reaberturas", "Mesmo_Dia", "Resolvidos", "Soma_Dias"]
+
+
+def dias_solucao(df):
+    """Dias até a solução (nulo em aberto): a coluna do snapshot ou calculada na hora"""
+    if "Dias_Solucao" in df.columns:
+        return df["Dias_Solucao"]
+    return (df["Solução"] - df["Abertura"]).dt.days
+
+
+def construir_cubo(df):
+    """Agrega o dataset no grão (AnoMes × Origem × Responsável × Tipo × Produto)
+
+    Guarda, por célula, a contagem de casos, a soma de reaberturas, os casos
+    resolvidos no mesmo dia, os casos resolvidos e a soma dos dias até a
+    solução. Nulos nas dimensões viram células próprias (dropna=False), para
+    que o filtro sobre o cubo tenha a mesma semântica do filtro sobre as linhas.
+    """
+    dias = dias_solucao(df)
+    resolvidos = dias.notna()
+    base = pd.DataFrame({
+        **{dim: df[dim] for dim in DIMENSOES_CUBO if dim in df.columns},
+        "Mes": df["Abertura"].dt.month,
+        "Casos": 1,
+        "Reaberturas": df["Qt Reab."],
+        "Mesmo_Dia": (df["Abertura"] == df["Solução"]).astype("int64"),
+        "Resolvidos": resolvidos.astype("int64"),
+        "Soma_Dias": dias.fillna(0).to_numpy(dtype="int64"),
+    })
+    dimensoes = [dim for dim in DIMENSOES_CUBO if dim in base.columns]
+    return (
+        base.groupby(dimensoes, observed=True, dropna=False, sort=True)[MEDIDAS_CUBO]
+        .sum()
+        .reset_index()
+    )
+
+
+class CuboCasos:
+    """Cubo pré-agregado do snapshot, com índice de filtros sobre as células
+
+    Construído uma vez por snapshot; as abas e os cards do resumo consultam
+    `fatiar(selecao)`, cujo custo depende do número de células e não do
+    número de linhas do dataset.
+    """
+
+    def __init__(self, df):
+        self.dados = construir_cubo(df)
+        self.indice = IndiceFiltros(self.dados)
+
+    @property
+    def nbytes(self):
+        return int(self.dados.memory_usage(index=True).sum()) + self.indice.nbytes
+
+    def __len__(self):
+        return len(self.dados)
+
+    def fatiar(self, selecao):
+        """Células do cubo que atendem à seleção da sidebar"""
+        return IndiceFiltros.aplicar(self.dados, self.indice.filtrar(selecao))
+
+
+def estatisticas_tempo(distribuicao, por):
+    """Contagem, soma, média, p50, p90 e máximo de dias por grupo
+
+    `distribuicao` tem uma linha por (dimensões, Dias_Solucao) com a contagem
+    em Casos. Depois de somar por (grupo, dias), cada grupo é uma faixa
+    contígua com os dias em ordem crescente: totais saem de reduceat e os
+    percentis (nearest-rank, exatos) de um searchsorted na contagem acumulada.
+    """
+    dist = distribuicao.groupby(por + ["Dias_Solucao"], observed=True)["Casos"].sum()
+    dist = dist[dist > 0]
+    if dist.empty:
+        return pd.DataFrame(columns=por + ["Total_Casos", "Soma_Dias", "Maximo", "P50", "P90", "Tempo_Medio"])
+
+    casos = dist.to_numpy(dtype="int64")
+    dias = dist.index.levels[-1].to_numpy(dtype="int64")[dist.index.codes[-1]]
+
+    # Início de cada grupo: onde algum nível de `por` muda
+    mudou = np.zeros(len(dist), dtype=bool)
+    mudou[0] = True
+    for codigos in dist.index.codes[:-1]:
+        mudou[1:] |= codigos[1:] != codigos[:-1]
+    inicios = np.flatnonzero(mudou)
+    fins = np.r_[inicios[1:], len(dist)]
+
+    acumulado = np.cumsum(casos)
+    antes = acumulado[inicios] - casos[inicios]
+    total = np.add.reduceat(casos, inicios)
+
+    resultado = dist.index[inicios].droplevel("Dias_Solucao").to_frame(index=False)
+    resultado["Total_Casos"] = total
+    resultado["Soma_Dias"] = np.add.reduceat(dias * casos, inicios)
+    resultado["Maximo"] = dias[fins - 1]
+    for coluna, quantil in (("P50", 0.5), ("P90", 0.9)):
+        alvo = antes + np.ceil(quantil * total).astype("int64")
+        resultado[coluna] = dias[np.searchsorted(acumulado, alvo, side="left")]
+    resultado["Tempo_Medio"] = resultado["Soma_Dias"] / resultado["Total_Casos"]
+    return resultado
+
+
+class DistribuicaoTempos:
+    """Distribuição dos dias até a solução no grão do cubo, por snapshot
+
+    Uma linha por (célula do cubo, dias) com o número de casos resolvidos.
+    Percentis não são aditivos como as medidas do cubo, mas a distribuição
+    é: qualquer recorte da sidebar é fatiado pelo índice e as estatísticas
+    (inclusive p50/p90) saem de `estatisticas_tempo` sem voltar às linhas.
+    """
+
+    def __init__(self, df):
+        dias = dias_solucao(df)
+        resolvidos = dias.notna().to_numpy()
+        base = pd.DataFrame({
+            **{dim: df[dim] for dim in DIMENSOES_CUBO if dim in df.columns},
+            "Mes": df["Abertura"].dt.month,
+            "Dias_Solucao": dias,
+        })[resolvidos]
+        base["Dias_Solucao"] = base["Dias_Solucao"].to_numpy(dtype="int32")
+        dimensoes = [dim for dim in DIMENSOES_CUBO if dim in base.columns]
+        self.dados = (
+            base.groupby(dimensoes + ["Dias_Solucao"], observed=True, dropna=False, sort=True)
+            .size()
+            .reset_index(name="Casos")
+        )
+        self.indice = IndiceFiltros(self.dados)
+
+    @property
+    def nbytes(self):
+        return int(self.dados.memory_usage(index=True).sum()) + self.indice.nbytes
+
+    def __len__(self):
+        return len(self.dados)
+
+    def fatiar(self, selecao):
+        """Linhas da distribuição que atendem à seleção da sidebar"""
+        return IndiceFiltros.aplicar(self.dados, self.indice.filtrar(selecao))
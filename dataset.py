@@ -0,0 +1,168 @@
+import threading
+import time
+from datetime import datetime
+
+import pandas as pd
+
+# Copy-on-write: fatias e colunas derivadas não duplicam o dataset compartilhado
+# (padrão a partir do pandas 3, onde a opção está obsoleta)
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
+
+class DatasetCompartilhado:
+    """Handle somente leitura do dataset, compartilhado por todas as sessões"""
+
+    def __init__(self, df, versao=None, gerado_em=None):
+        self._df = df
+        self.carregado_em = datetime.now()
+        self.gerado_em = gerado_em or self.carregado_em
+        self.versao = versao or self.carregado_em.strftime('%Y%m%d%H%M%S')
+        self.nbytes = int(df.memory_usage(deep=True).sum())
+        self._lock = threading.Lock()
+        self._derivados = {}
+
+    @property
+    def df(self):
+        return self._df
+
+    def derivado(self, nome, construir):
+        """Estrutura derivada do snapshot (índices etc.), construída uma única vez"""
+        with self._lock:
+            if nome not in self._derivados:
+                self._derivados[nome] = construir(self._df)
+            return self._derivados[nome]
+
+    @property
+    def idade(self):
+        """Tempo desde a geração/verificação dos dados"""
+        return datetime.now() - self.gerado_em
+
+    def __len__(self):
+        return len(self._df)
+
+
+class AtualizadorDataset:
+    """Recarrega o dataset em segundo plano e troca o snapshot atomicamente
+
+    As sessões sempre leem `atual`, que só é substituído (uma atribuição) depois
+    que o novo dataset está pronto; nenhum rerun espera pela ingestão, exceto a
+    primeira carga quando não há snapshot algum em disco. Se uma carga falhar,
+    a próxima tentativa ocorre após `intervalo_erro` (inclusive a primeira, que
+    deixa `atual` vazio até dar certo); `parar()` encerra a thread.
+    """
+
+    def __init__(self, carregar, intervalo=1800, inicial=None, gerado_em=None,
+                 atualizar_ja=False, assinatura=None, preparar=None, intervalo_erro=60):
+        self._carregar = carregar
+        self._preparar = preparar
+        self._assinatura = assinatura
+        self._ultima_assinatura = assinatura() if assinatura and inicial is not None else None
+        self.intervalo = intervalo
+        self.intervalo_erro = intervalo_erro
+        self._parado = False
+        self._lock = threading.Lock()
+        self._evento = threading.Event()
+        self._versao = 0
+        self._atual = None
+        self.em_atualizacao = False
+        self.ultimo_erro = None
+        # Duração e tamanho da última carga (roda fora dos reruns, em segundo plano)
+        self.ultima_carga = None
+
+        if inicial is None:
+            self.atualizar_agora()
+        else:
+            self._trocar(inicial, gerado_em)
+            if atualizar_ja:
+                self._evento.set()
+
+        self._thread = threading.Thread(target=self._executar, name="atualizador-dataset", daemon=True)
+        self._thread.start()
+
+    @property
+    def atual(self):
+        return self._atual
+
+    def _trocar(self, df, gerado_em=None):
+        with self._lock:
+            self._versao += 1
+            novo = DatasetCompartilhado(df, versao=self._versao, gerado_em=gerado_em)
+            # Estruturas derivadas são montadas antes da troca, fora do caminho das sessões
+            if self._preparar is not None:
+                self._preparar(novo)
+            self._atual = novo
+
+    def solicitar_atualizacao(self):
+        """Agenda uma atualização imediata sem bloquear quem chamou"""
+        self._evento.set()
+
+    def atualizar_agora(self):
+        """Executa a carga e, se bem-sucedida, publica o novo snapshot"""
+        self.em_atualizacao = True
+        inicio = time.perf_counter()
+        try:
+            df = self._carregar()
+            self.ultima_carga = {
+                'em': datetime.now(),
+                'segundos': round(time.perf_counter() - inicio, 3),
+                'linhas': len(df) if df is not None else None,
+            }
+            if df is None:
+                self.ultimo_erro = "Falha ao carregar os dados"
+                return
+            self.ultimo_erro = None
+
+            # Mesmos dados (origem inalterada): só renova a idade, sem nova versão
+            assinatura = self._assinatura() if self._assinatura else None
+            if assinatura is not None and assinatura == self._ultima_assinatura and self._atual is not None:
+                self._atual.gerado_em = datetime.now()
+                return
+            self._ultima_assinatura = assinatura
+            self._trocar(df)
+        except Exception as e:
+            self.ultimo_erro = str(e)
+        finally:
+            self.em_atualizacao = False
+
+    def parar(self):
+        """Encerra a thread de atualização (ao descartar o atualizador)"""
+        self._parado = True
+        self._evento.set()
+
+    def _executar(self):
+        while not self._parado:
+            self._evento.wait(timeout=self.intervalo_erro if self.ultimo_erro else self.intervalo)
+            self._evento.clear()
+            if not self._parado:
+                self.atualizar_agora()
+
+
+class RegistroMemoria:
+    """Contabiliza os bytes mantidos por cada sessão além do dataset compartilhado"""
+
+    def __init__(self, expira_em=1800):
+        self._lock = threading.Lock()
+        self._sessoes = {}
+        self.expira_em = expira_em
+
+    def registrar(self, sessao, nome, df):
+        """Registra (ou atualiza) um DataFrame próprio da sessão (None = nada alocado pela sessão)"""
+        nbytes = int(df.memory_usage(index=True).sum()) if df is not None else 0
+        with self._lock:
+            entrada = self._sessoes.setdefault(sessao, {'objetos': {}})
+            entrada['objetos'][nome] = nbytes
+            entrada['atualizado'] = time.time()
+
+    def resumo(self):
+        """DataFrame com bytes por sessão ativa (sessões inativas são descartadas)"""
+        limite = time.time() - self.expira_em
+        with self._lock:
+            for sessao in [s for s, e in self._sessoes.items() if e['atualizado'] < limite]:
+                del self._sessoes[sessao]
+            linhas = [
+                {'Sessão': sessao[:8], 'Objetos': len(e['objetos']),
+                 'Bytes': sum(e['objetos'].values())}
+                for sessao, e in self._sessoes.items()
+            ]
+        return pd.DataFrame(linhas, columns=['Sessão', 'Objetos', 'Bytes'])
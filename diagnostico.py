@@ -0,0 +1,168 @@
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+import pandas as pd
+
+# Arquivo JSON lines com as etapas de cada rerun instrumentado
+DIAGNOSTICO_ARQUIVO = os.environ.get("DIAGNOSTICO_ARQUIVO", "diagnostico.jsonl")
+
+_local = threading.local()
+_lock_arquivo = threading.Lock()
+
+
+class _EtapaInativa:
+    """Etapa sem coleta ativa: entra, sai e ignora atribuições (custo ~zero)"""
+
+    __slots__ = ()
+    linhas_saida = None
+    cache = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __setattr__(self, nome, valor):
+        pass
+
+
+_INATIVA = _EtapaInativa()
+
+
+class Etapa:
+    """Uma etapa cronometrada; etapas aninhadas viram 'pai/filho'"""
+
+    __slots__ = ('coleta', 'nome', 'linhas_entrada', 'linhas_saida', 'cache', '_inicio')
+
+    def __init__(self, coleta, nome, linhas_entrada=None):
+        self.coleta = coleta
+        self.nome = nome
+        self.linhas_entrada = linhas_entrada
+        self.linhas_saida = None
+        self.cache = None
+
+    def __enter__(self):
+        self.coleta._pilha.append(self.nome)
+        self._inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, tipo_erro, *exc):
+        segundos = time.perf_counter() - self._inicio
+        caminho = "/".join(self.coleta._pilha)
+        self.coleta._pilha.pop()
+        self.coleta.registros.append({
+            'etapa': caminho,
+            'ms': round(segundos * 1000, 3),
+            'linhas_entrada': self.linhas_entrada,
+            'linhas_saida': self.linhas_saida,
+            'cache': self.cache,
+            'erro': tipo_erro.__name__ if tipo_erro else None,
+        })
+        return False
+
+
+class ColetaDiagnostico:
+    """Etapas registradas durante um rerun de uma sessão"""
+
+    def __init__(self, sessao=None, fragmento=None):
+        self.sessao = sessao
+        # Nome do @st.fragment quando a coleta é de um rerun só do fragmento
+        self.fragmento = fragmento
+        self.iniciado_em = datetime.now()
+        self.registros = []
+        self._pilha = []
+        self._inicio = time.perf_counter()
+        self.total_ms = None
+        self.interrompida = False
+
+    def tabela(self):
+        """DataFrame com as etapas, na ordem em que terminaram"""
+        return pd.DataFrame(
+            self.registros,
+            columns=['etapa', 'ms', 'linhas_entrada', 'linhas_saida', 'cache', 'erro'],
+        )
+
+    def salvar(self, caminho=DIAGNOSTICO_ARQUIVO):
+        """Acrescenta uma linha JSON por etapa (e uma com o total do rerun)"""
+        base = {'rerun': self.iniciado_em.isoformat(), 'sessao': self.sessao, 'fragmento': self.fragmento}
+        linhas = [json.dumps({**base, **r}, ensure_ascii=False) for r in self.registros]
+        linhas.append(json.dumps({**base, 'etapa': 'rerun', 'ms': self.total_ms,
+                                  'erro': 'interrompido' if self.interrompida else None}, ensure_ascii=False))
+        with _lock_arquivo, open(caminho, 'a', encoding='utf-8') as f:
+            f.write("\n".join(linhas) + "\n")
+
+
+def iniciar_coleta(sessao=None, fragmento=None):
+    """Ativa a coleta de etapas para o rerun que roda nesta thread"""
+    coleta = ColetaDiagnostico(sessao, fragmento)
+    _local.coleta = coleta
+    return coleta
+
+
+def encerrar_coleta(caminho=DIAGNOSTICO_ARQUIVO, interrompida=False):
+    """Desativa a coleta da thread, grava as etapas em JSON lines e devolve a coleta
+
+    `interrompida` marca a coleta de um rerun que não chegou ao fim (exceção,
+    RerunException) e só é fechada no início do rerun seguinte.
+    """
+    coleta = getattr(_local, 'coleta', None)
+    _local.coleta = None
+    if coleta is None:
+        return None
+    coleta.interrompida = interrompida
+    coleta.total_ms = round((time.perf_counter() - coleta._inicio) * 1000, 3)
+    if caminho:
+        coleta.salvar(caminho)
+    return coleta
+
+
+@contextmanager
+def coleta_fragmento(nome, sessao=None, caminho=DIAGNOSTICO_ARQUIVO):
+    """Coleta própria de um rerun isolado de @st.fragment, gravada ao sair
+
+    Fora do rerun completo não há coleta ativa; sem isto as interações
+    dentro dos fragmentos não apareceriam no JSON lines. O corpo vira a
+    etapa `nome` e as linhas gravadas levam 'fragmento': nome.
+    """
+    encerrar_coleta(caminho, interrompida=True)
+    coleta = iniciar_coleta(sessao, fragmento=nome)
+    try:
+        with etapa(nome):
+            yield coleta
+    finally:
+        encerrar_coleta(caminho)
+
+
+def etapa(nome, linhas=None):
+    """Context manager que cronometra uma etapa (no-op sem coleta ativa)
+
+    Permite registrar linhas de saída e o status de cache:
+
+        with etapa("filter_data", linhas=len(df)) as e:
+            ...
+            e.linhas_saida = len(resultado)
+            e.cache = "hit"
+    """
+    coleta = getattr(_local, 'coleta', None)
+    if coleta is None:
+        return _INATIVA
+    return Etapa(coleta, nome, linhas)
+
+
+def cronometrado(nome=None):
+    """Decorator equivalente a `with etapa(nome):` em volta da função"""
+    def decorador(func):
+        rotulo = nome or func.__name__
+
+        @functools.wraps(func)
+        def envolvida(*args, **kwargs):
+            with etapa(rotulo):
+                return func(*args, **kwargs)
+        return envolvida
+    return decorador
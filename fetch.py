@@ -0,0 +1,107 @@
+import hashlib
+import json
+import os
+from datetime import datetime
+
+import gdown
+import requests
+
+from arquivos import arquivo_atomico, temporario_ao_lado
+
+# Estado da última busca (validadores HTTP, hash do conteúdo e contadores)
+FETCH_STATE_FILE = 'fetch_state.json'
+
+
+def _ler_estado(caminho):
+    try:
+        with open(caminho, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _salvar_estado(estado, caminho):
+    with arquivo_atomico(caminho, encoding='utf-8') as f:
+        json.dump(estado, f, ensure_ascii=False, indent=2)
+
+
+def _registrar(estado, alterado, motivo):
+    """Atualiza contadores de hit (sem mudança) e miss (download efetivo)"""
+    chave = 'misses' if alterado else 'hits'
+    estado[chave] = estado.get(chave, 0) + 1
+    estado['ultimo'] = {'alterado': alterado, 'motivo': motivo,
+                        'em': datetime.now().isoformat()}
+
+
+def _sha256(caminho):
+    h = hashlib.sha256()
+    with open(caminho, 'rb') as f:
+        for bloco in iter(lambda: f.read(1 << 20), b''):
+            h.update(bloco)
+    return h.hexdigest()
+
+
+def estatisticas_fetch(estado_caminho=FETCH_STATE_FILE):
+    """Retorna contadores de hits/misses e o resultado da última busca"""
+    estado = _ler_estado(estado_caminho)
+    return {
+        'hits': estado.get('hits', 0),
+        'misses': estado.get('misses', 0),
+        'ultimo': estado.get('ultimo'),
+    }
+
+
+def baixar_se_alterado(url, destino, estado_caminho=FETCH_STATE_FILE, timeout=60):
+    """Baixa a planilha só se ela mudou desde a última busca
+
+    Envia If-None-Match/If-Modified-Since quando há validadores salvos e,
+    se o servidor responder com conteúdo, compara o SHA-256 com o último
+    baixado. Retorna um dict com 'alterado' (bool) e 'motivo'.
+    """
+    estado = _ler_estado(estado_caminho)
+    mesma_origem = estado.get('url') == url and os.path.exists(destino)
+
+    headers = {}
+    if mesma_origem:
+        if estado.get('etag'):
+            headers['If-None-Match'] = estado['etag']
+        if estado.get('last_modified'):
+            headers['If-Modified-Since'] = estado['last_modified']
+
+    temporario = temporario_ao_lado(destino)
+    try:
+        with requests.get(url, headers=headers, stream=True, timeout=timeout) as resp:
+            if resp.status_code == 304 and mesma_origem:
+                _registrar(estado, False, 'not-modified')
+                _salvar_estado(estado, estado_caminho)
+                return {'alterado': False, 'motivo': 'not-modified'}
+            resp.raise_for_status()
+
+            if 'text/html' in resp.headers.get('Content-Type', ''):
+                # Página de confirmação do Google Drive: delega ao gdown
+                gdown.download(url, temporario, quiet=True)
+            else:
+                with open(temporario, 'wb') as f:
+                    for bloco in resp.iter_content(chunk_size=1 << 20):
+                        f.write(bloco)
+
+            validadores = {
+                'etag': resp.headers.get('ETag'),
+                'last_modified': resp.headers.get('Last-Modified'),
+            }
+
+        sha = _sha256(temporario)
+        estado.update(validadores, url=url)
+        if mesma_origem and sha == estado.get('sha256'):
+            _registrar(estado, False, 'hash-igual')
+            _salvar_estado(estado, estado_caminho)
+            return {'alterado': False, 'motivo': 'hash-igual'}
+
+        os.replace(temporario, destino)
+        estado['sha256'] = sha
+        _registrar(estado, True, 'download')
+        _salvar_estado(estado, estado_caminho)
+        return {'alterado': True, 'motivo': 'download'}
+    finally:
+        if os.path.exists(temporario):
+            os.remove(temporario)
@@ -0,0 +1,99 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+
+def _atualizar_hash(h, parte):
+    if isinstance(parte, (pd.DataFrame, pd.Series, pd.Index)):
+        if isinstance(parte, pd.DataFrame):
+            h.update(repr((list(parte.columns), list(parte.dtypes))).encode())
+        else:
+            h.update(repr((parte.name, parte.dtype)).encode())
+        h.update(pd.util.hash_pandas_object(parte, index=not isinstance(parte, pd.Index)).values.tobytes())
+    elif isinstance(parte, (np.ndarray, pd.Categorical)):
+        _atualizar_hash(h, pd.Index(parte))
+    elif isinstance(parte, (tuple, list)):
+        h.update(b'(')
+        for item in parte:
+            _atualizar_hash(h, item)
+        h.update(b')')
+    else:
+        h.update(repr(parte).encode())
+    h.update(b'|')
+
+
+def hash_conteudo(*partes):
+    """Hash estável do conteúdo (DataFrames, Series, arrays e escalares)"""
+    h = hashlib.blake2b(digest_size=16)
+    for parte in partes:
+        _atualizar_hash(h, parte)
+    return h.hexdigest()
+
+
+class FiguraSerializada(go.Figure):
+    """Figura já serializada: `to_dict` devolve o JSON guardado sem validar nada
+
+    O st.plotly_chart só chama `to_dict()` em instâncias de Figure, então
+    uma figura vinda do cache vai para o frontend sem reconstruir traces
+    nem passar pela validação do plotly.
+    """
+
+    def __init__(self, spec):
+        super().__init__()
+        self._spec = spec
+
+    def to_dict(self):
+        return json.loads(self._spec)
+
+    def to_json(self, *args, **kwargs):
+        return self._spec
+
+
+class CacheFiguras:
+    """Cache LRU de figuras serializadas, chaveado por tipo + hash do agregado
+
+    A chave combina o tipo do gráfico com o hash das entradas (agregados,
+    parâmetros e tema); reruns com os mesmos dados pulam a construção do
+    plotly. Limitado por número de entradas e por bytes do JSON.
+    """
+
+    def __init__(self, max_entradas=256, max_bytes=64 * 1024 * 1024):
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entradas = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def obter(self, tipo, entradas, construir):
+        """Figura em cache para (tipo, entradas) ou construída por `construir()`"""
+        chave = (tipo, hash_conteudo(entradas))
+        with self._lock:
+            spec = self._entradas.get(chave)
+            if spec is not None:
+                self._entradas.move_to_end(chave)
+                self.hits += 1
+                return FiguraSerializada(spec)
+            self.misses += 1
+
+        fig = construir()
+        spec = fig.to_json()
+        with self._lock:
+            if chave not in self._entradas and len(spec) <= self.max_bytes:
+                self._entradas[chave] = spec
+                self.bytes += len(spec)
+                while len(self._entradas) > self.max_entradas or self.bytes > self.max_bytes:
+                    _, antiga = self._entradas.popitem(last=False)
+                    self.bytes -= len(antiga)
+        return fig
+
+    def estatisticas(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses,
+                    'entradas': len(self._entradas), 'bytes': self.bytes}
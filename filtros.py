@@ -0,0 +1,302 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# Filtros da sidebar, na ordem de exibição: rótulo do multiselect e tipo dos valores
+FILTROS_SIDEBAR = {
+    "Ano": {'rotulo': "Ano:", 'tipo': int},
+    "Origem": {'rotulo': "Origem:"},
+    "Responsável": {'rotulo': "Responsável:"},
+    "Tipo": {'rotulo': "Tipo:"},
+    "Produto": {'rotulo': "Produto:"},
+}
+
+# Dimensões filtráveis (índices de filtro, cubo e cache valem para qualquer uma delas)
+DIMENSOES_FILTRO = list(FILTROS_SIDEBAR)
+
+
+def dimensoes_ativas(colunas, configuradas=None):
+    """Dimensões filtráveis desta variante que existem nas colunas carregadas
+
+    `configuradas` é uma lista ou um texto separado por vírgulas (como a
+    variável de ambiente FILTROS_DASHBOARD); None usa todas as de FILTROS_SIDEBAR.
+    """
+    if isinstance(configuradas, str):
+        configuradas = [dim.strip() for dim in configuradas.split(",") if dim.strip()]
+    return [dim for dim in (configuradas or DIMENSOES_FILTRO) if dim in FILTROS_SIDEBAR and dim in colunas]
+
+
+class OpcoesFiltros:
+    """Opções dos multiselects da sidebar e casos por valor, montados uma vez por snapshot
+
+    Para cada dimensão guarda os valores distintos (não nulos, em ordem e já
+    no tipo de FILTROS_SIDEBAR) e quantos casos têm cada um. Guarda também a
+    tabela de coocorrência das dimensões (casos por combinação de valores),
+    de onde saem os filtros em cascata: o custo de `facetas` depende do
+    número de combinações existentes, não do número de linhas.
+    """
+
+    def __init__(self, df, dimensoes=DIMENSOES_FILTRO):
+        self.opcoes = {}
+        self.contagens = {}
+        self._valores = {}
+        codigos_linhas = {}
+        for dim in dimensoes:
+            if dim not in df.columns:
+                continue
+            codigos, valores = pd.factorize(df[dim], sort=True)
+            contagens = np.bincount(codigos[codigos >= 0], minlength=len(valores))
+            tipo = FILTROS_SIDEBAR.get(dim, {}).get('tipo')
+            self.opcoes[dim] = [tipo(v) if tipo is not None else v for v in pd.Index(valores).tolist()]
+            self.contagens[dim] = dict(zip(self.opcoes[dim], contagens.tolist()))
+            self._valores[dim] = pd.Index(self.opcoes[dim])
+            codigos_linhas[dim] = codigos
+
+        # Coocorrência: cada combinação vira um inteiro em base mista (nulo = dígito 0)
+        chave = np.zeros(len(df), dtype=np.int64)
+        for dim, codigos in codigos_linhas.items():
+            chave = chave * (len(self.opcoes[dim]) + 1) + (codigos + 1)
+        combinacoes, casos = np.unique(chave, return_counts=True)
+        self.casos = casos
+        self.celulas = {}
+        for dim in reversed(list(codigos_linhas)):
+            base = len(self.opcoes[dim]) + 1
+            # Código -1 (nulo) fica na última posição das máscaras de `facetas`
+            self.celulas[dim] = (combinacoes % base - 1).astype(np.int32)
+            combinacoes = combinacoes // base
+
+    @property
+    def nbytes(self):
+        return self.casos.nbytes + sum(codigos.nbytes for codigos in self.celulas.values())
+
+    def facetas(self, dimensoes, excluidos=None):
+        """Valores possíveis de cada dimensão e casos de cada um, dadas as exclusões nas demais
+
+        `excluidos` mapeia dimensão -> valores desmarcados. Dimensões de
+        `dimensoes` são filtros ativos (linhas com nulo nelas nunca entram,
+        como no IndiceFiltros); as demais não restringem. Cada dimensão é
+        contada sem as próprias exclusões, então continua oferecendo os
+        valores que o usuário desmarcou.
+        """
+        excluidos = excluidos or {}
+        dimensoes = [dim for dim in dimensoes if dim in self.celulas]
+        permitidas = {}
+        for dim in dimensoes:
+            permitido = np.ones(len(self.opcoes[dim]) + 1, dtype=bool)
+            permitido[-1] = False
+            fora = self._valores[dim].get_indexer(pd.Index(list(excluidos.get(dim, ()))))
+            permitido[fora[fora >= 0]] = False
+            permitidas[dim] = permitido[self.celulas[dim]]
+
+        resultado = {}
+        for dim in dimensoes:
+            mascara = self.celulas[dim] >= 0
+            for outra, permitida in permitidas.items():
+                if outra != dim:
+                    mascara &= permitida
+            contagens = np.bincount(self.celulas[dim][mascara], weights=self.casos[mascara],
+                                    minlength=len(self.opcoes[dim])).astype(np.int64)
+            resultado[dim] = {
+                valor: casos for valor, casos in zip(self.opcoes[dim], contagens.tolist()) if casos > 0
+            }
+        return resultado
+
+
+def rotulo_opcao(contagens):
+    """format_func do multiselect: valor seguido do número de casos"""
+    return lambda valor: f"{valor} ({contagens.get(valor, 0):,})"
+
+
+def atualizar_excluidos(excluidos, mostrados, selecionados):
+    """Valores desmarcados de uma dimensão depois de uma interação com o multiselect
+
+    Dos valores mostrados, ficam excluídos os que não estão selecionados; os
+    que não estavam na lista (sem casos pelas outras dimensões) mantêm o
+    estado anterior, para voltarem como estavam quando reaparecerem.
+    """
+    selecionados = set(selecionados)
+    visiveis = set(mostrados)
+    return ([v for v in excluidos if v not in visiveis]
+            + [v for v in mostrados if v not in selecionados])
+
+
+class IndiceFiltros:
+    """Índice invertido por dimensão, construído uma vez por snapshot
+
+    Para cada dimensão guarda o código de cada linha e, para cada valor, a
+    lista ordenada das linhas que o contêm. Um filtro parte da dimensão mais
+    seletiva (menos linhas somando os valores escolhidos) e testa as demais
+    apenas sobre esses candidatos, então o custo acompanha a cardinalidade
+    selecionada e não o total de linhas. Dimensões com todos os valores
+    marcados (e sem nulos) não restringem nada e são ignoradas.
+    """
+
+    def __init__(self, df, dimensoes=DIMENSOES_FILTRO):
+        self.linhas = len(df)
+        self.dimensoes = {}
+        for dim in dimensoes:
+            if dim not in df.columns:
+                continue
+            codigos, valores = pd.factorize(df[dim], sort=True)
+            codigos = codigos.astype(np.int32)
+            validos = codigos >= 0
+            contagens = np.bincount(codigos[validos], minlength=len(valores))
+            ordem = np.argsort(codigos, kind='stable').astype(np.int32)
+            nulos = int((~validos).sum())
+            self.dimensoes[dim] = {
+                'codigos': codigos,
+                'valores': pd.Index(valores),
+                'contagens': contagens,
+                # Linhas do valor i: posicoes[inicios[i]:inicios[i + 1]]
+                'posicoes': ordem[nulos:],
+                'inicios': np.concatenate([[0], np.cumsum(contagens)]),
+                'nulos': nulos,
+            }
+
+    @property
+    def nbytes(self):
+        return sum(
+            info['codigos'].nbytes + info['posicoes'].nbytes + info['inicios'].nbytes
+            for info in self.dimensoes.values()
+        )
+
+    def _restricao(self, dim, selecionados):
+        info = self.dimensoes[dim]
+        codigos_sel = info['valores'].get_indexer(pd.Index(list(selecionados)))
+        codigos_sel = np.unique(codigos_sel[codigos_sel >= 0])
+        if len(codigos_sel) == len(info['valores']) and info['nulos'] == 0:
+            return None
+        # Posição extra no final para o código -1 (nulo), nunca permitido
+        permitido = np.zeros(len(info['valores']) + 1, dtype=bool)
+        permitido[codigos_sel] = True
+        custo = int(info['contagens'][codigos_sel].sum())
+        return custo, dim, codigos_sel, permitido
+
+    def _restricoes(self, selecao):
+        restricoes = []
+        for dim, selecionados in selecao.items():
+            if dim not in self.dimensoes:
+                continue
+            restricao = self._restricao(dim, selecionados)
+            if restricao is not None:
+                restricoes.append(restricao)
+        return restricoes
+
+    def restringe(self, selecao):
+        """False quando a seleção mantém todas as linhas (filtrar devolveria None)"""
+        return bool(self._restricoes(selecao))
+
+    def filtrar(self, selecao):
+        """Posições (ordenadas) das linhas que atendem à seleção
+
+        `selecao` mapeia dimensão -> valores aceitos, com a mesma semântica do
+        `isin`; dimensões ausentes da seleção não restringem.
+        """
+        restricoes = self._restricoes(selecao)
+
+        if not restricoes:
+            return None
+        restricoes.sort(key=lambda r: r[0])
+
+        _, dim, codigos_sel, _ = restricoes[0]
+        info = self.dimensoes[dim]
+        candidatos = np.concatenate(
+            [info['posicoes'][info['inicios'][c]:info['inicios'][c + 1]] for c in codigos_sel]
+            or [np.empty(0, dtype=np.int32)]
+        )
+        if len(codigos_sel) > 1:
+            candidatos.sort()
+
+        for _, dim, _, permitido in restricoes[1:]:
+            if len(candidatos) == 0:
+                break
+            candidatos = candidatos[permitido[self.dimensoes[dim]['codigos'][candidatos]]]
+        return candidatos
+
+    @staticmethod
+    def aplicar(df, posicoes):
+        """Materializa a seleção (sem cópia quando nenhuma dimensão restringe)"""
+        return df if posicoes is None else df.take(posicoes)
+
+
+def canonizar_selecao(selecao):
+    """Chave estável para a seleção: ordem dos valores e das dimensões não importa"""
+    return tuple(
+        (dim, tuple(sorted({v.item() if hasattr(v, 'item') else v for v in valores}, key=str)))
+        for dim, valores in sorted(selecao.items())
+    )
+
+
+class CachePorSelecao:
+    """Cache LRU de resultados por versão do snapshot + seleção da sidebar
+
+    Evita hashear o DataFrame inteiro a cada chamada (como o st.cache_data faz)
+    e limita o cache por número de entradas e por bytes. Entradas de versões
+    anteriores do snapshot são descartadas assim que uma versão mais nova
+    aparece; consultas com uma versão anterior não descartam nada. Cada tipo
+    de resultado (filtros, tabelas das abas) usa a sua instância, com limites
+    e estatísticas próprios.
+    """
+
+    def __init__(self, max_entradas=16, max_bytes=32 * 1024 * 1024):
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entradas = OrderedDict()
+        self._versao = None
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _remover(self, chave):
+        _, nbytes = self._entradas.pop(chave)
+        self.bytes -= nbytes
+
+    def obter(self, versao, selecao, calcular):
+        """Resultado em cache para (versao, selecao) ou calcula e armazena"""
+        chave = (versao, canonizar_selecao(selecao))
+        with self._lock:
+            # Só uma versão mais nova descarta as antigas: sessões ainda no snapshot
+            # anterior (durante a troca) consultam sem apagar as entradas da nova
+            if self._versao is None or versao > self._versao:
+                for antiga in [c for c in self._entradas if c[0] != versao]:
+                    self._remover(antiga)
+                self._versao = versao
+            if chave in self._entradas:
+                self._entradas.move_to_end(chave)
+                self.hits += 1
+                return self._entradas[chave][0]
+            self.misses += 1
+
+        resultado = calcular()
+        nbytes = int(resultado.memory_usage(index=True).sum())
+        with self._lock:
+            if chave not in self._entradas and nbytes <= self.max_bytes:
+                self._entradas[chave] = (resultado, nbytes)
+                self.bytes += nbytes
+                while len(self._entradas) > self.max_entradas or self.bytes > self.max_bytes:
+                    self._remover(next(iter(self._entradas)))
+        return resultado
+
+    def contem(self, resultado):
+        """True se o objeto é uma entrada do cache (memória compartilhada, não da sessão)"""
+        with self._lock:
+            return any(entrada is resultado for entrada, _ in self._entradas.values())
+
+    def estatisticas(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses,
+                    'entradas': len(self._entradas), 'bytes': self.bytes}
+
+
+class CacheFiltros(CachePorSelecao):
+    """Cache dos DataFrames filtrados (analise.filtrar)
+
+    Seleções que não restringem nada devolvem o próprio dataset e não passam
+    por aqui, ver analise.filtrar.
+    """
+
+    def __init__(self, max_entradas=64, max_bytes=512 * 1024 * 1024):
+        super().__init__(max_entradas=max_entradas, max_bytes=max_bytes)
@@ -0,0 +1,284 @@
+import time
+import tracemalloc
+from itertools import islice
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+
+# Colunas calculadas a partir da planilha bruta
+COLUNAS_DERIVADAS = ["AnoMes", "AnoMes_Display", "Ano", "Conta_Resumida", "Responsável", "Dias_Solucao"]
+
+# Identidade do caso: primeira coluna encontrada + datas de abertura/solução
+# (sem nenhuma delas, a chave é o conteúdo da linha; ver hash_linhas)
+COLUNAS_IDENTIDADE = ["Caso", "Número", "Protocolo", "ID"]
+COLUNAS_DATAS = ["Abertura", "Solução"]
+
+# Linhas por bloco na leitura em streaming da planilha
+CHUNK_LINHAS = 50_000
+
+# Fração de linhas novas/alteradas acima da qual a ingestão completa é mais barata
+LIMITE_DELTA_INCREMENTAL = 0.3
+
+HASH_LINHA = "_hash_linha"
+HASH_CHAVE = "_hash_chave"
+
+RESPONSAVEIS_OUTROS = {
+    "Alexsandro Fernandes Maffei", "Ana Caroline Mendes Carvalho",
+    "Brenda Bertotti Ribeiro", "Bruno Macagnan Do Nascimento",
+    "Cleiton Bitencourt De Souza", "Cristian Macagnan Reus",
+    "Douglas Gonçalves E Barra", "Fabiana Bressan",
+    "Filipe Dos Santos Batista", "Guilherme De Costa Sonego",
+    "Guilherme Medeiros Rodrigues", "Henrique Da Rosa Josefino",
+    "Inaiá Rovaris", "João Victor Dagostin Dos Santos",
+    "João Vitor Ghellere", "Jose Victor Padilha Inacio",
+    "Kenny Robert Rodrigues", "Lucas Demetrio De Abreu",
+    "Lucas Demetrio Pizzoni", "Lucas Jacques Costa",
+    "Luiz Gustavo Uggioni Savi", "Marlon De Bem",
+    "Otomar Rocha Speck", "Outro", "Rafael Dias Rocha (Rafa)",
+    "Ramiriz Leal", "Susan Carboni"
+}
+
+
+MESES_PT = {
+    1: 'Jan', 2: 'Fev', 3: 'Mar', 4: 'Abr', 5: 'Mai', 6: 'Jun',
+    7: 'Jul', 8: 'Ago', 9: 'Set', 10: 'Out', 11: 'Nov', 12: 'Dez'
+}
+
+
+def formatar_mes_pt(data):
+    """Formata data para mês abreviado em português"""
+    return f"{MESES_PT[data.month]}/{data.year}"
+
+
+def _nomes_colunas(cabecalho):
+    """Nomes de coluna no mesmo padrão do pd.read_excel"""
+    nomes = []
+    for i, nome in enumerate(cabecalho):
+        nomes.append(f"Unnamed: {i}" if nome is None else str(nome))
+    return nomes
+
+
+def ler_planilha(caminho, chunk_linhas=CHUNK_LINHAS, medir_memoria=False):
+    """Lê a planilha em blocos (openpyxl read-only) com memória limitada
+
+    Cada bloco de linhas é convertido em colunas tipadas e descartado, então
+    o pico fica próximo do tamanho final do DataFrame. Retorna o DataFrame e
+    um dict com linhas, blocos, tempo e (se medir_memoria) o pico em bytes.
+    """
+    inicio = time.perf_counter()
+    if medir_memoria:
+        tracemalloc.start()
+
+    wb = load_workbook(caminho, read_only=True, data_only=True)
+    try:
+        linhas = wb.active.iter_rows(values_only=True)
+        colunas = _nomes_colunas(next(linhas, ()))
+        buffers = {col: [] for col in colunas}
+        blocos = 0
+
+        while True:
+            bloco = [
+                linha for linha in islice(linhas, chunk_linhas)
+                if any(v is not None for v in linha)
+            ]
+            if not bloco:
+                break
+            blocos += 1
+            for col, valores in zip(colunas, zip(*bloco)):
+                serie = pd.Series(valores)
+                if col in COLUNAS_DATAS:
+                    serie = pd.to_datetime(serie, errors='coerce')
+                buffers[col].append(serie)
+            del bloco
+    finally:
+        wb.close()
+
+    df = pd.DataFrame({
+        col: pd.concat(partes, ignore_index=True) if partes else pd.Series(dtype=object)
+        for col, partes in buffers.items()
+    })
+
+    estatisticas = {
+        'linhas': len(df),
+        'blocos': blocos,
+        'chunk_linhas': chunk_linhas,
+        'segundos': round(time.perf_counter() - inicio, 3),
+        'pico_bytes': None,
+    }
+    if medir_memoria:
+        estatisticas['pico_bytes'] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return df, estatisticas
+
+
+def _mapear_unicos(serie, func):
+    """Aplica func só sobre os valores distintos e espalha pelos códigos"""
+    codigos, unicos = pd.factorize(serie)
+    tabela = np.array([func(valor) for valor in unicos] + [np.nan], dtype=object)
+    return pd.Series(tabela[codigos], index=serie.index)
+
+
+def _resumir_conta(conta):
+    return ' '.join(conta.split()[:2])
+
+
+def calcular_colunas_derivadas(df):
+    """Calcula as colunas derivadas sobre a planilha bruta (vetorizado)
+
+    Mês/ano vira uma chave inteira (ano * 100 + mês) e os textos são obtidos
+    de tabelas de lookup sobre as chaves distintas; Conta e Responsável são
+    transformados apenas nos valores únicos.
+    """
+    abertura = df["Abertura"]
+    ano = abertura.dt.year
+    chave_mes = ano * 100 + abertura.dt.month
+
+    def _ano_mes(chave):
+        return f"{int(chave) // 100:04d}-{int(chave) % 100:02d}"
+
+    def _ano_mes_display(chave):
+        return f"{MESES_PT[int(chave) % 100]}/{int(chave) // 100}"
+
+    df["AnoMes"] = _mapear_unicos(chave_mes, _ano_mes)
+    df["AnoMes_Display"] = _mapear_unicos(chave_mes, _ano_mes_display)
+    df["Ano"] = ano
+    df["Conta_Resumida"] = _mapear_unicos(df["Conta"], _resumir_conta)
+    # Dias até a solução (nulo para casos em aberto), calculado uma vez por ingestão
+    df["Dias_Solucao"] = (df["Solução"] - df["Abertura"]).dt.days
+    responsavel = df['Responsável']
+    df['Responsável'] = responsavel.where(~responsavel.isin(RESPONSAVEIS_OUTROS), "Outro")
+    return df
+
+
+def colunas_chave(df):
+    """Colunas que identificam um caso: identidade + Abertura/Solução (None sem identidade)"""
+    identidade = next((c for c in COLUNAS_IDENTIDADE if c in df.columns), None)
+    if identidade is None:
+        return None
+    return [identidade] + [c for c in COLUNAS_DATAS if c in df.columns]
+
+
+def hash_linhas(df_bruto):
+    """Calcula os hashes de chave e de conteúdo de cada linha bruta
+
+    Sem coluna de identidade (Caso/Número/Protocolo/ID) a chave é o próprio
+    hash de conteúdo: uma linha editada conta como removida + nova.
+    """
+    hash_linha = pd.util.hash_pandas_object(df_bruto, index=False).values
+    colunas = colunas_chave(df_bruto)
+    if colunas is None:
+        return hash_linha, hash_linha
+    return pd.util.hash_pandas_object(df_bruto[colunas], index=False).values, hash_linha
+
+
+def preparar_completo(df_bruto):
+    """Ingestão completa: hashes + colunas derivadas para todas as linhas"""
+    hash_chave, hash_linha = hash_linhas(df_bruto)
+    df = calcular_colunas_derivadas(df_bruto)
+    df[HASH_CHAVE] = hash_chave
+    df[HASH_LINHA] = hash_linha
+    return df
+
+
+def _posicoes_anteriores(hashes_anteriores, hash_linha):
+    """Posição no snapshot anterior de cada linha nova pelo hash de conteúdo (-1 se não existe)
+
+    Planilhas atualizadas costumam manter as linhas no lugar (edições e
+    linhas acrescentadas no fim): primeiro casa posição a posição, em O(n)
+    sem tabela hash, e só as linhas que sobram são procuradas por hash
+    entre as linhas anteriores ainda livres.
+    """
+    comuns = min(len(hashes_anteriores), len(hash_linha))
+    origem = np.full(len(hash_linha), -1, dtype=np.int64)
+    alinhadas = np.flatnonzero(hashes_anteriores[:comuns] == hash_linha[:comuns])
+    origem[alinhadas] = alinhadas
+
+    pendentes = np.flatnonzero(origem < 0)
+    if len(pendentes):
+        livres = np.ones(len(hashes_anteriores), dtype=bool)
+        livres[alinhadas] = False
+        livres = np.flatnonzero(livres)
+        hashes = pd.Index(hashes_anteriores[livres])
+        primeiras = ~hashes.duplicated()
+        posicoes = hashes[primeiras].get_indexer(hash_linha[pendentes])
+        origem[pendentes] = np.where(posicoes >= 0, livres[primeiras][np.maximum(posicoes, 0)], -1)
+    return origem
+
+
+def _combinar_por_posicao(anterior, recalculada, origem, linhas_delta, n):
+    """Coluna final: valores do snapshot anterior (por posição) + linhas recalculadas
+
+    Categóricas continuam categóricas (categorias antigas + novas), sem
+    voltar a texto; as demais são montadas com uma única concatenação.
+    """
+    reaproveitar = origem >= 0
+    if isinstance(anterior.dtype, pd.CategoricalDtype):
+        categorias = anterior.cat.categories
+        novas = pd.Index(recalculada.dropna().unique()).difference(categorias)
+        if len(novas):
+            categorias = categorias.append(novas)
+        codigos = np.empty(n, dtype=np.int32)
+        codigos[reaproveitar] = anterior.cat.codes.to_numpy()[origem[reaproveitar]]
+        codigos[linhas_delta] = categorias.get_indexer(recalculada)
+        return pd.Categorical.from_codes(codigos, dtype=pd.CategoricalDtype(categorias))
+
+    valores = pd.concat(
+        [anterior.take(origem[reaproveitar]), recalculada], ignore_index=True
+    )
+    ordem = np.empty(n, dtype=np.int64)
+    ordem[np.concatenate([np.flatnonzero(reaproveitar), linhas_delta])] = np.arange(n)
+    return valores.take(ordem).array
+
+
+def mesclar_incremental(anterior, df_bruto, limite_delta=LIMITE_DELTA_INCREMENTAL):
+    """Mescla a planilha nova com o snapshot anterior, recalculando só o delta
+
+    Linhas cujo conteúdo bruto já existe no snapshot anterior reaproveitam as
+    colunas derivadas (copiadas por posição); apenas linhas novas ou alteradas
+    são recalculadas. Linhas ausentes na planilha nova são descartadas. Com
+    mais de `limite_delta` das linhas a recalcular, a ingestão completa sai
+    mais barata e é usada no lugar. 'alteradas' só é contado quando a
+    planilha tem coluna de identidade (ver hash_linhas).
+    """
+    if anterior is None or HASH_LINHA not in anterior.columns or not set(COLUNAS_DERIVADAS) <= set(anterior.columns):
+        df = preparar_completo(df_bruto)
+        return df, {'modo': 'completo', 'novas': len(df), 'alteradas': 0,
+                    'removidas': 0, 'inalteradas': 0}
+
+    hash_chave, hash_linha = hash_linhas(df_bruto)
+    origem = _posicoes_anteriores(anterior[HASH_LINHA].to_numpy(), hash_linha)
+    reaproveitar = origem >= 0
+    delta = ~reaproveitar
+    linhas_delta = np.flatnonzero(delta)
+
+    if len(linhas_delta) > limite_delta * len(df_bruto):
+        df = calcular_colunas_derivadas(df_bruto)
+        modo = 'completo'
+    else:
+        # Derivadas de linhas inalteradas vêm direto do snapshot anterior, por posição
+        recalculadas = calcular_colunas_derivadas(df_bruto.iloc[linhas_delta].copy())
+        df = df_bruto.copy()
+        for col in COLUNAS_DERIVADAS:
+            df[col] = _combinar_por_posicao(
+                anterior[col], recalculadas[col], origem, linhas_delta, len(df)
+            )
+        modo = 'incremental'
+    df[HASH_CHAVE] = hash_chave
+    df[HASH_LINHA] = hash_linha
+
+    # Estatísticas só sobre as linhas sem par (O(delta)): alterada = chave de uma linha anterior
+    # que perdeu o par; removida = linha anterior sem par cuja chave não voltou no delta
+    usadas = np.zeros(len(anterior), dtype=bool)
+    usadas[origem[reaproveitar]] = True
+    chaves_livres = pd.Index(anterior[HASH_CHAVE].to_numpy()[~usadas])
+    chaves_delta = pd.Index(hash_chave[delta])
+    alteradas = int(chaves_delta.isin(chaves_livres).sum())
+    estatisticas = {
+        'modo': modo,
+        'novas': len(linhas_delta) - alteradas,
+        'alteradas': alteradas,
+        'removidas': int((~chaves_livres.isin(chaves_delta)).sum()),
+        'inalteradas': int(reaproveitar.sum()),
+    }
+    return df, estatisticas
@@ -0,0 +1,104 @@
+import os
+from datetime import timedelta
+
+from arquivos import VooUnico, trava_arquivo
+from fetch import baixar_se_alterado, estatisticas_fetch
+from ingest import ler_planilha, mesclar_incremental
+from schema import comparar_memoria, compactar_schema
+from snapshot_store import (
+    COLUNAS_DASHBOARD, SCHEMA_VERSION, carregar_snapshot, ler_metadados,
+    renovar_snapshot, salvar_snapshot, snapshot_valido,
+)
+
+FILE_ID = "1SqSOc1xsb1i9hxq2OziyxWHrG3GAs450"
+TTL_SNAPSHOT = timedelta(minutes=30)
+
+# Arquivos de trabalho compartilhados entre sessões, processos e réplicas
+TEMP_FILE = 'temp_file.xlsx'
+LOCK_FILE = 'data_cache.lock'
+
+_voo_unico = VooUnico()
+
+
+def url_origem():
+    """URL da planilha (CASOS_URL permite apontar para outro servidor)"""
+    return os.environ.get("CASOS_URL", f"https://drive.google.com/uc?id={FILE_ID}")
+
+
+def carregar_snapshot_existente():
+    """Snapshot em disco (mesmo expirado) e seus metadados, para a carga inicial"""
+    meta = ler_metadados()
+    if meta and meta.get('versao_schema') == SCHEMA_VERSION:
+        try:
+            return carregar_snapshot(colunas=COLUNAS_DASHBOARD, meta=meta), meta
+        except Exception:
+            pass
+    return None, meta
+
+
+def carregar_dados(incremental=True):
+    """Carrega o dataset do dashboard (snapshot válido ou nova ingestão)
+
+    Chamadas simultâneas no mesmo processo são coalescidas e, entre processos,
+    a ingestão roda sob trava de arquivo: N misses simultâneos resultam em um
+    único download/parse, e os demais leem o snapshot recém-publicado.
+    """
+    meta = ler_metadados()
+    if snapshot_valido(meta, TTL_SNAPSHOT):
+        try:
+            return carregar_snapshot(colunas=COLUNAS_DASHBOARD, meta=meta)
+        except Exception:
+            pass
+    return _voo_unico.executar(('ingestao', incremental), lambda: _ingerir_com_trava(incremental))
+
+
+def _ingerir_com_trava(incremental):
+    with trava_arquivo(LOCK_FILE):
+        # Outro processo pode ter publicado o snapshot enquanto aguardávamos a trava
+        meta = ler_metadados()
+        if snapshot_valido(meta, TTL_SNAPSHOT):
+            try:
+                return carregar_snapshot(colunas=COLUNAS_DASHBOARD, meta=meta)
+            except Exception:
+                pass
+        return _ingerir(meta, incremental)
+
+
+def _ingerir(meta, incremental):
+    url = url_origem()
+
+    # ✅ OTIMIZAÇÃO: Busca condicional - sem mudança na origem, só renova o TTL
+    busca = baixar_se_alterado(url, TEMP_FILE)
+    if not busca['alterado'] and meta and meta.get('versao_schema') == SCHEMA_VERSION:
+        try:
+            df = carregar_snapshot(colunas=COLUNAS_DASHBOARD, meta=meta)
+            renovar_snapshot(extra={'fetch': estatisticas_fetch()})
+            return df
+        except Exception:
+            pass
+
+    # ✅ OTIMIZAÇÃO: Leitura em streaming (blocos de linhas, memória limitada)
+    df_bruto, leitura = ler_planilha(TEMP_FILE)
+
+    # ✅ OTIMIZAÇÃO: Ingestão incremental - só linhas novas/alteradas são recalculadas
+    anterior = None
+    if incremental:
+        try:
+            anterior = carregar_snapshot(memory_map=False, meta=meta)
+        except Exception:
+            anterior = None
+
+    df, delta = mesclar_incremental(anterior, df_bruto)
+
+    # ✅ OTIMIZAÇÃO: Schema compacto (categóricas + inteiros reduzidos)
+    compacto = compactar_schema(df)
+    memoria = comparar_memoria(df, compacto)
+    df = compacto
+
+    # Salvar snapshot colunar + sidecar de metadados
+    salvar_snapshot(df, extra={
+        'origem': url, 'leitura': leitura, 'ingestao': delta,
+        'fetch': estatisticas_fetch(), 'memoria': memoria
+    })
+
+    return df[[c for c in COLUNAS_DASHBOARD if c in df.columns]]
@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+
+# Colunas de texto com poucos valores distintos -> dictionary encoding
+COLUNAS_CATEGORICAS = [
+    "Origem", "Tipo", "Responsável", "Produto", "Conta", "Conta_Resumida",
+    "AnoMes", "AnoMes_Display",
+]
+
+# Colunas duplicadas em relação a outra coluna do dataset
+COLUNAS_DUPLICADAS = ["Data de Abertura"]
+
+
+def _reduzir_inteiro(serie):
+    """Converte para o menor tipo inteiro possível (float32 se houver nulos)"""
+    if serie.isna().any():
+        return serie.astype(np.float32)
+    return pd.to_numeric(serie, downcast='integer')
+
+
+def _inteiro_nulavel(serie):
+    """Inteiro nullable (Int16, ou Int32 se não couber): nulos sem cair para float"""
+    maior = serie.abs().max()
+    return serie.astype("Int16" if pd.isna(maior) or maior < 2 ** 15 else "Int32")
+
+
+def compactar_schema(df):
+    """Aplica o schema compacto: categóricas, inteiros reduzidos, sem duplicatas"""
+    df = df.drop(columns=[c for c in COLUNAS_DUPLICADAS if c in df.columns])
+
+    for col in COLUNAS_CATEGORICAS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype('category')
+
+    # AnoMes_Display em ordem cronológica (segue a ordem de AnoMes)
+    if "AnoMes" in df.columns and "AnoMes_Display" in df.columns:
+        ordem = (
+            df[["AnoMes", "AnoMes_Display"]].dropna().drop_duplicates()
+            .astype(str).sort_values("AnoMes")["AnoMes_Display"].unique()
+        )
+        df["AnoMes_Display"] = df["AnoMes_Display"].cat.set_categories(ordem)
+
+    for col in ["Ano", "Qt Reab."]:
+        if col in df.columns:
+            df[col] = _reduzir_inteiro(df[col])
+
+    if "Dias_Solucao" in df.columns:
+        df["Dias_Solucao"] = _inteiro_nulavel(df["Dias_Solucao"])
+
+    return df
+
+
+def relatorio_memoria(df):
+    """Memória ocupada por coluna (bytes, incluindo objetos Python)"""
+    uso = df.memory_usage(deep=True, index=False)
+    return pd.DataFrame({
+        'Coluna': uso.index,
+        'Tipo': [str(df[col].dtype) for col in uso.index],
+        'Bytes': uso.values,
+    }).sort_values('Bytes', ascending=False, ignore_index=True)
+
+
+def comparar_memoria(antes, depois):
+    """Resumo antes/depois por coluna, para o sidecar do snapshot"""
+    r_antes = relatorio_memoria(antes).set_index('Coluna')['Bytes']
+    r_depois = relatorio_memoria(depois).set_index('Coluna')['Bytes']
+    return {
+        'total_antes': int(r_antes.sum()),
+        'total_depois': int(r_depois.sum()),
+        'colunas': {
+            col: {'antes': int(r_antes[col]), 'depois': int(r_depois.get(col, 0))}
+            for col in r_antes.index
+        },
+    }
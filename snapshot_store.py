@@ -0,0 +1,133 @@
+import json
+import os
+import uuid
+from datetime import datetime
+
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from arquivos import arquivo_atomico, temporario_ao_lado, trava_arquivo
+
+# Snapshot colunar (Arrow IPC sem compressão -> pode ser lido via memory-map)
+SNAPSHOT_FILE = 'data_cache.arrow'
+META_FILE = 'data_cache.meta.json'
+SCHEMA_VERSION = 3
+
+# Identificador gravado no schema do Arrow e no sidecar: o leitor confere que são da mesma geração
+CHAVE_ID_SNAPSHOT = b'id_snapshot'
+
+# Colunas efetivamente usadas pelo dashboard (leitura a frio lê só estas)
+COLUNAS_DASHBOARD = [
+    "Abertura", "Solução", "Origem", "Responsável", "Tipo", "Produto",
+    "Qt Reab.", "AnoMes", "AnoMes_Display", "Ano", "Conta_Resumida", "Dias_Solucao",
+]
+
+
+def _trava_metadados(meta_caminho):
+    """Trava do sidecar entre processos (própria: a ingestão já segura a trava do loader)"""
+    return trava_arquivo(meta_caminho + '.lock')
+
+
+def salvar_snapshot(df, caminho=SNAPSHOT_FILE, meta_caminho=META_FILE, extra=None):
+    """Grava o DataFrame como Arrow IPC e, por último, o sidecar de metadados
+
+    Os dois levam o mesmo `id_snapshot`; um leitor que pegue o Arrow novo com
+    o sidecar antigo (ou o contrário) percebe em `carregar_snapshot`.
+    """
+    df = df.copy(deep=False)
+    df.columns = df.columns.map(str)
+    id_snapshot = uuid.uuid4().hex
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata(
+        {**(table.schema.metadata or {}), CHAVE_ID_SNAPSHOT: id_snapshot.encode()}
+    )
+
+    # Escrita atômica: leitores (inclusive via memory-map) mantêm o arquivo antigo
+    temporario = temporario_ao_lado(caminho)
+    try:
+        feather.write_feather(table, temporario, compression='uncompressed')
+        os.replace(temporario, caminho)
+    finally:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+
+    agora = datetime.now().isoformat()
+    meta = {
+        'gerado_em': agora,
+        'dados_em': agora,
+        'formato': 'arrow-ipc',
+        'versao_schema': SCHEMA_VERSION,
+        'id_snapshot': id_snapshot,
+        'linhas': len(df),
+        'colunas': list(df.columns),
+    }
+    if extra:
+        meta.update(extra)
+    with _trava_metadados(meta_caminho), arquivo_atomico(meta_caminho, encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+    return meta
+
+
+def ler_metadados(meta_caminho=META_FILE):
+    """Lê o sidecar de metadados (None se ausente ou inválido)"""
+    try:
+        with open(meta_caminho, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        meta['gerado_em'] = datetime.fromisoformat(meta['gerado_em'])
+        return meta
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def snapshot_valido(meta, ttl, caminho=SNAPSHOT_FILE):
+    """Verifica se o snapshot existe, tem o schema atual e está dentro do TTL"""
+    if not meta or not os.path.exists(caminho):
+        return False
+    if meta.get('versao_schema') != SCHEMA_VERSION or meta.get('expirado'):
+        return False
+    return datetime.now() - meta['gerado_em'] < ttl
+
+
+def carregar_snapshot(caminho=SNAPSHOT_FILE, colunas=None, memory_map=True, meta=None):
+    """Lê o snapshot via memory-map, materializando só as colunas pedidas
+
+    Com `meta`, confere que o arquivo é o mesmo descrito pelo sidecar
+    (ValueError se forem de gerações diferentes). O arquivo é aberto uma
+    única vez, então a conferência e a leitura veem o mesmo conteúdo.
+    """
+    with (pa.memory_map(caminho, 'r') if memory_map else pa.OSFile(caminho, 'rb')) as source:
+        leitor = pa.ipc.open_file(source)
+        esperado = (meta or {}).get('id_snapshot')
+        if esperado is not None:
+            encontrado = (leitor.schema.metadata or {}).get(CHAVE_ID_SNAPSHOT, b'').decode()
+            if encontrado != esperado:
+                raise ValueError(f"snapshot {encontrado or '?'} não corresponde aos metadados {esperado}")
+        table = leitor.read_all()
+    if colunas is not None:
+        table = table.select([c for c in colunas if c in table.schema.names])
+    return table.to_pandas(split_blocks=True)
+
+
+def _reescrever_metadados(meta_caminho, **campos):
+    with _trava_metadados(meta_caminho):
+        meta = ler_metadados(meta_caminho)
+        if meta is None:
+            return None
+        meta.update(campos)
+        meta['gerado_em'] = meta['gerado_em'].isoformat()
+        with arquivo_atomico(meta_caminho, encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+    return meta
+
+
+def invalidar_snapshot(meta_caminho=META_FILE):
+    """Marca o snapshot como expirado; os dados ficam como base incremental"""
+    _reescrever_metadados(meta_caminho, expirado=True)
+
+
+def renovar_snapshot(meta_caminho=META_FILE, extra=None):
+    """Renova o TTL de um snapshot cuja origem não mudou"""
+    campos = dict(extra or {})
+    return _reescrever_metadados(
+        meta_caminho, expirado=False, gerado_em=datetime.now(), **campos
+    )